@@ -1,16 +1,55 @@
-from dataclasses import dataclass, asdict, field
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Tuple
 
 # Add required standard imports and detect requests availability
-import os, sys, json, re, time, random
+import os, sys, json, re, time, random, struct, mmap, hashlib, threading, queue, atexit, logging, heapq, sqlite3, pickle, zlib, gc, bisect, math
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from array import array
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
 try:
     import requests
     REQUESTS_AVAILABLE = True
 except Exception:
     REQUESTS_AVAILABLE = False
+# Optional faster JSON decoder for the Yelp dataset; falls back to the stdlib parser
+try:
+    import orjson
+    _json_loads = orjson.loads
+    FAST_JSON_AVAILABLE = True
+except Exception:
+    _json_loads = json.loads
+    FAST_JSON_AVAILABLE = False
+# Optional NumPy for the columnar business table; the array/list fallback gives the same results
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except Exception:
+    np = None
+    NUMPY_AVAILABLE = False
 
 DATA_FILE = os.path.join(os.path.dirname(__file__), "coding_programming_data.json")
+# Storage backend: "json" (DATA_FILE is the store) or "sqlite" (SQLITE_FILE is the store; JSON is import/export only)
+STORAGE_BACKEND = os.environ.get("LOCAL_LIFT_STORAGE", "json").strip().lower()
+SQLITE_FILE = os.path.splitext(DATA_FILE)[0] + ".sqlite3"
+# JSON backend: small mutations are appended here and folded into DATA_FILE by a background compaction
+JOURNAL_FILE = os.path.splitext(DATA_FILE)[0] + ".journal"
+JOURNAL_COMPACT_BYTES = 256 * 1024
+# save scheduler: write after this many idle seconds, but never later than SAVE_MAX_DELAY_SECONDS after the first change
+SAVE_DEBOUNCE_SECONDS = 0.75
+SAVE_MAX_DELAY_SECONDS = 5.0
+# binary copy of DATA_FILE (pickle protocol 5) loaded at startup instead of parsing the JSON, when it matches it
+SNAPSHOT_FILE = os.path.splitext(DATA_FILE)[0] + ".snapshot"
+SNAPSHOT_MAGIC = b"LLSNAP01"
+SNAPSHOT_VERSION = 2
+# magic, format version, DATA_FILE size, DATA_FILE mtime (ns), crc32 of the pickle payload
+_SNAPSHOT_HEADER = struct.Struct("<8sIQqQI")
+# number of *_backup.json generations kept by save_data (made by hard link/rename, never by copying)
+BACKUP_GENERATIONS = 3
 YELP_BUSINESS_FILE = "/Users/zayanjami/Downloads/Yelp JSON/yelp_dataset/yelp_academic_dataset_business.json"
+YELP_REVIEW_FILE = os.path.join(os.path.dirname(YELP_BUSINESS_FILE), "yelp_academic_dataset_review.json")
+# number of review texts attached per Yelp business; the rest only count towards the rating aggregates
+YELP_REVIEWS_PER_BUSINESS = 5
 AUTO_IMPORT_CITY = "Las Vegas"
 AUTO_IMPORT_LIMIT = 200
 
@@ -31,29 +70,151 @@ BIG_CHAINS = [
 ]
 
 # Replace existing is_big_chain with a normalization-aware check
+# every ASCII byte except a-z and 0-9; deleted by bytes.translate in normalize_name
+_NON_ALNUM_BYTES = bytes(c for c in range(128) if not (48 <= c <= 57 or 97 <= c <= 122))
+
+@lru_cache(maxsize=65536)
+def _normalize_cached(s: str) -> str:
+    # lower() first (it can map some non-ASCII letters to ASCII), then drop non-ASCII and non-alphanumerics
+    return sys.intern(s.lower().encode("ascii", "ignore").translate(None, _NON_ALNUM_BYTES).decode("ascii"))
+
 def normalize_name(s: str) -> str:
-    """Return a normalized string with only lowercase alphanumerics."""
+    """Return a normalized string with only lowercase alphanumerics (memoized and interned)."""
     if not s:
         return ""
-    return re.sub(r'[^a-z0-9]', '', s.lower())
+    return _normalize_cached(s)
+
+def business_key(name: str, address: str) -> str:
+    """Stable favorites/identity key: normalized name and address joined by '|'."""
+    return normalize_name(name or "") + "|" + normalize_name(address or "")
+
+class ChainMatcher:
+    """Aho-Corasick automaton over normalized chain names.
+    matches() reports whether a normalized name contains any chain as a substring in one pass,
+    so the cost per name does not grow with the number of chains.
+    """
+    def __init__(self, names):
+        goto: List[Dict[str, int]] = [{}]
+        out: List[bool] = [False]
+        self.size = 0
+        for name in names:
+            pattern = normalize_name(name)
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append(False)
+                node = nxt
+            out[node] = True
+            self.size += 1
+        fail = [0] * len(goto)
+        pending = deque(goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for ch, nxt in goto[node].items():
+                pending.append(nxt)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                out[nxt] = out[nxt] or out[fail[nxt]]
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def matches(self, normalized: str) -> bool:
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in normalized:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                return True
+        return False
+
+# Optional extra chain names, one per line ('#' starts a comment); merged with BIG_CHAINS
+BIG_CHAINS_FILE = os.path.join(os.path.dirname(__file__), "big_chains.txt")
+
+def load_chain_names(path: str) -> List[str]:
+    """Return the chain names listed in path, or [] if the file does not exist."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return [line.split("#", 1)[0].strip() for line in f if line.split("#", 1)[0].strip()]
+    except Exception:
+        return []
+
+def set_big_chains(names) -> None:
+    """Replace the chain list used by is_big_chain/is_big_chain_many with names (compiled once)."""
+    global _chain_matcher
+    _chain_matcher = ChainMatcher(names)
 
 def is_big_chain(name: str) -> bool:
     """Return True if the business name matches a known big chain (punctuation/space-insensitive)."""
     if not name:
         return False
-    norm = normalize_name(name)
-    for chain in BIG_CHAINS:
-        if normalize_name(chain) in norm:
-            return True
-    return False
+    return _chain_matcher.matches(normalize_name(name))
 
-# Add lightweight logging and OSM tag normalization utilities
-LOG_PATH = os.path.expanduser("~/.business_app.log")
+def is_big_chain_many(names) -> List[bool]:
+    """Batch form of is_big_chain: one flag per name, in order."""
+    matcher = _chain_matcher
+    return [bool(n) and matcher.matches(normalize_name(n)) for n in names]
 
-def log(msg: str):
+set_big_chains(BIG_CHAINS + load_chain_names(BIG_CHAINS_FILE))
+
+# Logging: one queue drained by a background thread into size-rotated files, plus OSM tag normalization utilities
+LOG_PATH = os.path.expanduser("~/.business_app.log")
+OSM_LOG_PATH = os.path.expanduser("~/.business_app_osm_import.log")
+YELP_DEBUG_LOG_PATH = os.path.expanduser("~/yelp_debug.log")
+LOG_LEVEL = os.environ.get("LOCAL_LIFT_LOG_LEVEL", "INFO").upper()
+LOG_MAX_BYTES = 2 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+# with DEBUG logging on, write a per-record Yelp line for one in every N records scanned
+YELP_DEBUG_SAMPLE_EVERY = 1000
+
+_LOG_CHANNELS = {"app": LOG_PATH, "osm": OSM_LOG_PATH, "yelp": YELP_DEBUG_LOG_PATH}
+_log_listener = None
+_log_lock = threading.Lock()
+
+def _start_log_listener():
+    """Attach a QueueHandler to each channel logger and start one QueueListener that writes the rotating files."""
+    q = queue.SimpleQueue()
+    level = getattr(logging, LOG_LEVEL, logging.INFO)
+    fmt = logging.Formatter("[%(asctime)s] %(levelname)s %(message)s", "%Y-%m-%d %H:%M:%S")
+    handlers = []
+    for channel, path in _LOG_CHANNELS.items():
+        name = f"local_lift.{channel}"
+        handler = RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8", delay=True)
+        handler.setFormatter(fmt)
+        handler.addFilter(logging.Filter(name))
+        handlers.append(handler)
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+        logger.propagate = False
+        logger.addHandler(QueueHandler(q))
+    listener = QueueListener(q, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+def get_logger(channel: str = "app") -> logging.Logger:
+    """Return the logger for channel ('app', 'osm' or 'yelp'); the background writer starts on first use."""
+    global _log_listener
+    if _log_listener is None:
+        with _log_lock:
+            if _log_listener is None:
+                _log_listener = _start_log_listener()
+    return logging.getLogger(f"local_lift.{channel}")
+
+def log(msg: str, level: int = logging.INFO, channel: str = "app"):
     try:
-        with open(LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {msg}\n")
+        get_logger(channel).log(level, msg)
     except Exception:
         pass
 
@@ -75,24 +236,166 @@ def normalize_osm_tags(user: str) -> str:
     }
     return aliases.get(s, s)
 
-@dataclass
 class Review:
-    rating: int
-    text: str
-    timestamp: float = field(default_factory=time.time)
+    __slots__ = ("rating", "text", "timestamp", "source")
+
+    def __init__(self, rating: int, text: str, timestamp: Optional[float] = None, source: str = ""):
+        self.rating = rating
+        self.text = text
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.source = source
+
+    def to_dict(self) -> Dict:
+        return {"rating": self.rating, "text": self.text, "timestamp": self.timestamp, "source": self.source}
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.rating, self.text, self.timestamp, self.source) == (other.rating, other.text, other.timestamp, other.source)
+
+    def __repr__(self):
+        return f"Review(rating={self.rating!r}, text={self.text!r}, timestamp={self.timestamp!r}, source={self.source!r})"
+
+def _review_stats(review_dicts) -> list:
+    """[count, rating total, {rating: count}] over raw review dicts, without building Review objects."""
+    count, total, hist = 0, 0, {}
+    for r in review_dicts:
+        if not isinstance(r, dict):
+            continue
+        rating = r.get("rating", 0)
+        count += 1
+        total += rating
+        try:
+            hist[int(rating)] = hist.get(int(rating), 0) + 1
+        except Exception:
+            pass
+    return [count, total, hist]
 
-@dataclass
 class Business:
-    id: int
-    name: str
-    category: str
-    address: str
-    deal: str = ""
-    reviews: List[Review] = field(default_factory=list)
+    """A listing plus its stored reviews.
+    Reviews load lazily: build_businesses attaches the raw review dicts, and the Review list is only built
+    when something reads .reviews. Rating count/total/histogram are kept as running aggregates so
+    avg_rating() and review_count() are O(1).
+    """
+    # public fields, in serialization order
+    FIELDS = ("id", "name", "category", "address", "deal", "reviews", "external_id", "extra_ratings")
+    __slots__ = ("id", "name", "category", "address", "deal", "external_id", "extra_ratings",
+                 "_reviews", "_review_source", "_stats", "_key_cache", "_entry", "_entry_reviews")
+
+    def __init__(self, id: int, name: str, category: str, address: str, deal: str = "",
+                 reviews: Optional[List[Review]] = None, external_id: str = "", extra_ratings: Optional[List[int]] = None):
+        self._review_source = None
+        self._key_cache = None
+        self._entry_reviews = 0
+        self.id = id
+        self.name = name
+        self.category = category
+        self.address = address
+        self.deal = deal
+        self.reviews = reviews
+        self.external_id = external_id
+        # counts of 1..5 star ratings whose review texts are not stored in `reviews` (e.g. the bulk of a Yelp corpus)
+        self.extra_ratings = extra_ratings if extra_ratings is not None else []
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in Business.FIELDS:
+            # a field assignment invalidates the cached serialized entry (see persist_businesses)
+            object.__setattr__(self, "_entry", None)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in Business.FIELDS)
+
+    def __repr__(self):
+        return "Business(" + ", ".join(f"{f}={getattr(self, f)!r}" for f in Business.FIELDS) + ")"
+
+    @property
+    def reviews(self) -> List[Review]:
+        """The Review list, materialized from the backing raw review dicts on first access."""
+        source = self._review_source
+        if source is not None:
+            self._reviews = [Review(r.get("rating",0), r.get("text",""), r.get("timestamp",time.time()), r.get("source",""))
+                             for r in source if isinstance(r, dict)]
+            self._review_source = None
+            if self._entry is not None:
+                # the cached entry already holds exactly these reviews
+                self._entry_reviews = len(self._reviews)
+        return self._reviews
+
+    @reviews.setter
+    def reviews(self, value) -> None:
+        self._reviews = list(value) if value is not None else []
+        self._review_source = None
+        self._stats = self._stats_for(self._reviews)
+
+    @staticmethod
+    def _stats_for(reviews) -> list:
+        count, total, hist = 0, 0, {}
+        for r in reviews:
+            count += 1
+            total += r.rating
+            try:
+                hist[int(r.rating)] = hist.get(int(r.rating), 0) + 1
+            except Exception:
+                pass
+        return [count, total, hist]
+
+    @property
+    def reviews_loaded(self) -> bool:
+        return self._review_source is None
+
+    def _review_aggregates(self) -> list:
+        stats = self._stats
+        if self._review_source is None and len(self._reviews) != stats[0]:
+            # the list was edited directly rather than through add_review()
+            stats = self._stats = self._stats_for(self._reviews)
+        return stats
+
+    def add_review(self, review: Review) -> None:
+        """Append a review and update the running aggregates."""
+        self.reviews.append(review)
+        stats = self._stats
+        stats[0] += 1
+        stats[1] += review.rating
+        try:
+            stats[2][int(review.rating)] = stats[2].get(int(review.rating), 0) + 1
+        except Exception:
+            pass
+
     def avg_rating(self):
-        return sum(r.rating for r in self.reviews) / len(self.reviews) if self.reviews else 0.0
+        count = self.review_count()
+        if not count:
+            return 0.0
+        total = self._review_aggregates()[1] + sum(star * n for star, n in enumerate(self.extra_ratings, 1))
+        return total / count
+
     def review_count(self):
-        return len(self.reviews)
+        return self._review_aggregates()[0] + sum(self.extra_ratings)
+
+    def stable_key(self) -> str:
+        """Return business_key(name, address), recomputed only when name or address changes."""
+        cached = self._key_cache
+        if cached is None or cached[0] is not self.name or cached[1] is not self.address:
+            cached = (self.name, self.address, business_key(self.name, self.address))
+            self._key_cache = cached
+        return cached[2]
+
+    def rating_histogram(self) -> Dict[int, int]:
+        """Return {rating: count} over the stored reviews plus extra_ratings."""
+        hist = dict(self._review_aggregates()[2])
+        for star, n in enumerate(self.extra_ratings, 1):
+            if n:
+                hist[star] = hist.get(star, 0) + n
+        return hist
+
+def _business_review_dicts(b: Business) -> List[Dict]:
+    """The business's reviews as dicts, reusing the raw dicts if the reviews were never materialized."""
+    source = b._review_source
+    if source is not None:
+        return [r for r in source if isinstance(r, dict)]
+    return [r.to_dict() for r in b.reviews]
 
 def default_data():
     return {"businesses": [
@@ -101,106 +404,1872 @@ def default_data():
         {"id": 3, "name": "QuickFix Phone Repair", "category": "services", "address": "200 Oak Blvd", "deal": "Free screen protector", "reviews": []},
     ], "favorites": []}
 
-def save_data(data):
-    """Save data to DATA_FILE. Create a backup of the previous file as *_backup.json before overwriting."""
+# id(entry) -> (entry, its values, review count, encoded text) from the previous write.
+# Business entries in raw['businesses'] are copy-on-write: code that changes a stored entry puts a new dict
+# in its place (dict(entry, field=value)); nested values (reviews, review dicts, extra_ratings) are never
+# edited in place. _business_entry, persist_businesses, _apply_journal_op, apply_yelp_changes,
+# apply_yelp_review_aggregates and ensure_numeric_ids_for_raw follow this; an in-place nested edit would
+# be written with the stale cached text.
+_encoded_entries: Dict[int, tuple] = {}
+_encoded_entries_lock = threading.Lock()
+
+def _encode_entries(entries, indent: int) -> List[str]:
+    """Encode business dicts for a document written with `indent`, reusing the previous write's text for entries
+    that are the same object with the same top-level values (entries are copy-on-write, see above)."""
+    prefix = "\n" + " " * (indent * 2)
+    encode = json.JSONEncoder(indent=indent, ensure_ascii=False).encode
+    fresh: Dict[int, tuple] = {}
+    out = []
+    with _encoded_entries_lock:
+        for entry in entries:
+            if not isinstance(entry, dict):
+                out.append(encode(entry).replace("\n", prefix))
+                continue
+            values = tuple(entry.values())
+            reviews = entry.get("reviews")
+            reviews_len = len(reviews) if isinstance(reviews, list) else -1
+            cached = _encoded_entries.get(id(entry))
+            # the cache keeps the old values alive, so an unchanged tuple means no value was replaced
+            if cached is not None and cached[0] is entry and cached[2] == reviews_len and cached[1] == values:
+                text = cached[3]
+            else:
+                text = encode(entry).replace("\n", prefix)
+            fresh[id(entry)] = (entry, values, reviews_len, text)
+            out.append(text)
+        _encoded_entries.clear()
+        _encoded_entries.update(fresh)
+    return out
+
+def _iter_json_document(data, indent: int):
+    """Yield the text json.dump(data, indent=indent, ensure_ascii=False) would write, with the
+    'businesses' entries encoded through _encode_entries."""
+    if not isinstance(data, dict) or not isinstance(data.get("businesses"), list) or not data["businesses"]:
+        yield json.dumps(data, indent=indent, ensure_ascii=False)
+        return
+    pad = " " * indent
+    yield "{"
+    for i, (key, value) in enumerate(data.items()):
+        yield ("," if i else "") + "\n" + pad + json.dumps(str(key), ensure_ascii=False) + ": "
+        if key == "businesses":
+            yield "[\n" + pad * 2
+            yield (",\n" + pad * 2).join(_encode_entries(value, indent))
+            yield "\n" + pad + "]"
+        else:
+            yield json.dumps(value, indent=indent, ensure_ascii=False).replace("\n", "\n" + pad)
+    yield "\n}"
+
+def _temp_path(path: str) -> str:
+    """Temp file name beside path that is unique per process and thread, so concurrent writers
+    (save worker, journal compaction, export) never share or rename each other's half-written file."""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+def _write_json_temp(path: str, data, indent=2) -> str:
+    """Serialize data to a fsync'ed temp file beside path and return the temp path (caller renames it into place)."""
+    tmp_path = _temp_path(path)
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f, _gc_paused():
+            f.writelines(_iter_json_document(data, indent))
+            f.flush()
+            os.fsync(f.fileno())
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except Exception:
+            pass
+        raise
+    return tmp_path
+
+def _backup_path(generation: int) -> str:
+    suffix = "_backup.json" if generation == 1 else f"_backup.{generation}.json"
+    return DATA_FILE.replace('.json', suffix)
+
+def _rotate_backups() -> bool:
+    """Shift *_backup.json generations down by rename and hard-link DATA_FILE as the newest one.
+    Returns False if hard links are unavailable (the caller then renames DATA_FILE to the backup instead)."""
+    if BACKUP_GENERATIONS < 1:
+        return True
+    try:
+        os.remove(_backup_path(BACKUP_GENERATIONS))
+    except FileNotFoundError:
+        pass
+    for gen in range(BACKUP_GENERATIONS - 1, 0, -1):
+        if os.path.exists(_backup_path(gen)):
+            os.replace(_backup_path(gen), _backup_path(gen + 1))
+    try:
+        os.link(DATA_FILE, _backup_path(1))
+        return True
+    except Exception:
+        return False
+
+def _save_json_data(data, journal_seq: int = 0):
+    """Save data to DATA_FILE atomically: write a temp file, rotate backups by rename/hard link, rename into place.
+    journal_seq is the last journal op data already contains; it goes into the snapshot header, not the JSON."""
+    try:
+        tmp_path = _write_json_temp(DATA_FILE, data)
+    except Exception as e:
+        log(f"Saving {DATA_FILE} failed: {e}", logging.ERROR)
+        return False
     try:
         if os.path.exists(DATA_FILE):
-            backup_file = DATA_FILE.replace('.json', '_backup.json')
             try:
-                with open(DATA_FILE, 'r', encoding='utf-8') as src, open(backup_file, 'w', encoding='utf-8') as dst:
-                    dst.write(src.read())
-                try:
-                    log(f"Created backup: {backup_file}")
-                except Exception:
-                    pass
-            except Exception:
+                if not _rotate_backups():
+                    os.replace(DATA_FILE, _backup_path(1))
+            except Exception as e:
                 # continue even if backup fails
-                pass
-        with open(DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-    except Exception:
-        # Best-effort fallback: try writing without pretty formatting
+                log(f"Backup rotation failed: {e}", logging.WARNING)
+        os.replace(tmp_path, DATA_FILE)
+        _write_data_snapshot(data, journal_seq)
+        return True
+    except Exception as e:
+        log(f"Saving {DATA_FILE} failed: {e}", logging.ERROR)
         try:
-            with open(DATA_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f)
+            os.remove(tmp_path)
         except Exception:
             pass
+        return False
 
-def load_data():
+@contextmanager
+def _gc_paused():
+    """Suspend the cyclic GC while bulk-loading acyclic data (it otherwise rescans every new dict repeatedly)."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+def _write_data_snapshot(data, journal_seq: int = 0) -> None:
+    """Write SNAPSHOT_FILE for the DATA_FILE that was just written (best effort; stale snapshots are ignored on load)."""
+    ident = _file_identity(DATA_FILE)
+    if ident is None:
+        return
+    tmp_path = _temp_path(SNAPSHOT_FILE)
+    try:
+        payload = pickle.dumps(data, protocol=5)
+        with open(tmp_path, "wb") as f:
+            f.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, ident[0], ident[1], journal_seq, zlib.crc32(payload)))
+            f.write(payload)
+        os.replace(tmp_path, SNAPSHOT_FILE)
+    except Exception as e:
+        log(f"Writing snapshot failed: {e}", logging.WARNING)
+        try:
+            os.remove(tmp_path)
+        except Exception:
+            pass
+
+def _load_data_snapshot() -> Optional[Tuple[Dict, int]]:
+    """Return (dataset, journal_seq) from SNAPSHOT_FILE if it was written for the current DATA_FILE and its checksum matches."""
+    ident = _file_identity(DATA_FILE)
+    if ident is None or not os.path.exists(SNAPSHOT_FILE):
+        return None
+    try:
+        with open(SNAPSHOT_FILE, "rb") as f:
+            blob = f.read()
+        magic, version, size, mtime_ns, journal_seq, crc = _SNAPSHOT_HEADER.unpack_from(blob)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or (size, mtime_ns) != ident:
+            return None
+        payload = memoryview(blob)[_SNAPSHOT_HEADER.size:]
+        if zlib.crc32(payload) != crc:
+            log(f"Snapshot checksum mismatch, reading {DATA_FILE}", logging.WARNING)
+            return None
+        with _gc_paused():
+            data = pickle.loads(payload)
+    except Exception as e:
+        log(f"Snapshot load failed: {e}", logging.WARNING)
+        return None
+    if not isinstance(data, dict) or not data.get("businesses"):
+        return None
+    data.setdefault("favorites", [])
+    return data, journal_seq
+
+def _load_json_store() -> Tuple[Dict, int]:
+    """Load DATA_FILE, preferring its binary snapshot when that is current (a missing/stale one is rewritten).
+    Returns (data, journal_seq). Without a current snapshot the seq is unknown and 0 is returned; replaying
+    ops the file already holds is harmless because journal ops are idempotent."""
+    loaded = _load_data_snapshot()
+    if loaded is None:
+        loaded = _load_json_data(), 0
+        _write_data_snapshot(*loaded)
+    return loaded
+
+def _load_json_data():
     if not os.path.exists(DATA_FILE):
-        d = default_data(); save_data(d); return d
+        d = default_data(); _save_json_data(d); return d
     try:
         with open(DATA_FILE, "r", encoding="utf-8") as f:
             data = json.load(f)
     except:
-        data = default_data(); save_data(data); return data
+        data = default_data(); _save_json_data(data); return data
     if not isinstance(data, dict):
-        data = default_data(); save_data(data)
+        data = default_data(); _save_json_data(data)
     data.setdefault("businesses", []); data.setdefault("favorites", [])
+    data.pop("journal_seq", None)  # written by older versions; the seq now lives in the snapshot header
     if not data["businesses"]:
-        data = default_data(); save_data(data)
+        data = default_data(); _save_json_data(data)
     return data
 
+_journal_lock = threading.RLock()
+_journal_state = {"seq": 0, "snapshot_gen": 0, "compacting": False}
+
+def _journal_compacting_path() -> str:
+    return JOURNAL_FILE + ".compacting"
+
+def _apply_journal_op(data: Dict, op: Dict, by_id: Dict) -> None:
+    """Apply one journal op to data; by_id maps business id -> index in data['businesses'].
+    Changed business entries are replaced, not edited in place (see _encode_entries)."""
+    businesses = data.get("businesses", [])
+    kind = op.get("op")
+    if kind == "favorites":
+        removed = set(op.get("remove", []))
+        favs = [k for k in data.get("favorites", []) if k not in removed]
+        present = set(favs)
+        favs.extend(k for k in op.get("add", []) if k not in present)
+        data["favorites"] = favs
+    elif kind == "review":
+        i = by_id.get(op.get("id"))
+        review = op.get("review", {})
+        if i is not None and review not in businesses[i].get("reviews", []):
+            businesses[i] = dict(businesses[i], reviews=list(businesses[i].get("reviews", [])) + [review])
+
+def _replay_journal_file(data: Dict, path: str, after_seq: int) -> int:
+    """Apply ops from path with seq > after_seq to data. A torn last line ends the replay. Returns the last seq."""
+    last = after_seq
+    if not os.path.exists(path):
+        return last
+    by_id = {b.get("id"): i for i, b in enumerate(data.get("businesses", [])) if isinstance(b, dict)}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    op = json.loads(line)
+                except Exception:
+                    break
+                seq = op.get("seq", 0)
+                if seq <= after_seq:
+                    continue
+                _apply_journal_op(data, op, by_id)
+                last = max(last, seq)
+    except Exception as e:
+        log(f"Journal replay failed for {path}: {e}", logging.ERROR)
+    return last
+
+def replay_journal(data: Dict, journal_seq: int = 0) -> Dict:
+    """Bring a freshly loaded snapshot up to date with the journal (and any interrupted compaction).
+    journal_seq is the last op the snapshot already contains (see _load_json_store)."""
+    with _journal_lock:
+        seq = _replay_journal_file(data, _journal_compacting_path(), journal_seq)
+        seq = _replay_journal_file(data, JOURNAL_FILE, seq)
+        _journal_state["seq"] = max(_journal_state["seq"], seq)
+    return data
+
+def append_journal(op: Dict) -> bool:
+    """Append one mutation to JOURNAL_FILE. Returns False if it could not be written (caller should do a full save).
+    Ops are keyed by business id, so callers flush pending full saves first (see save_favorites): replay must
+    never apply an op to an older DATA_FILE whose ids mean different businesses."""
+    try:
+        with _journal_lock:
+            _journal_state["seq"] += 1
+            op = dict(op, seq=_journal_state["seq"])
+            with open(JOURNAL_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(op, ensure_ascii=False) + "\n")
+            size = os.path.getsize(JOURNAL_FILE)
+    except Exception as e:
+        log(f"Journal append failed: {e}", logging.ERROR)
+        return False
+    if size >= JOURNAL_COMPACT_BYTES:
+        start_journal_compaction()
+    return True
+
+def _clear_journal_after_snapshot() -> int:
+    """Called under _journal_lock right before a full snapshot is written; returns the journal seq it covers."""
+    _journal_state["snapshot_gen"] += 1
+    return _journal_state["seq"]
+
+def _remove_journal_files() -> None:
+    for path in (JOURNAL_FILE, _journal_compacting_path()):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            log(f"Could not remove journal {path}: {e}", logging.WARNING)
+
+def compact_journal() -> None:
+    """Fold the journal into DATA_FILE. The journal is rotated aside first so appends continue meanwhile;
+    the new snapshot is dropped if a full save happened while it was being built."""
+    compacting = _journal_compacting_path()
+    try:
+        with _journal_lock:
+            if not os.path.exists(compacting):
+                if not os.path.exists(JOURNAL_FILE):
+                    return
+                os.replace(JOURNAL_FILE, compacting)
+            gen = _journal_state["snapshot_gen"]
+        data, seq = _load_json_store()
+        seq = _replay_journal_file(data, compacting, seq)
+        tmp_path = _write_json_temp(DATA_FILE, data)
+        with _journal_lock:
+            if gen != _journal_state["snapshot_gen"]:
+                os.remove(tmp_path)
+                return
+            os.replace(tmp_path, DATA_FILE)
+            _write_data_snapshot(data, seq)
+            os.remove(compacting)
+        log(f"Compacted journal into {DATA_FILE}")
+    except Exception as e:
+        log(f"Journal compaction failed: {e}", logging.ERROR)
+    finally:
+        _journal_state["compacting"] = False
+
+def start_journal_compaction() -> None:
+    with _journal_lock:
+        if _journal_state["compacting"]:
+            return
+        _journal_state["compacting"] = True
+    threading.Thread(target=compact_journal, name="journal-compaction", daemon=True).start()
+
+class SqliteStore:
+    """SQLite (WAL) backend holding businesses, reviews and favorites.
+    save() replaces the whole dataset in one transaction; add_review() and set_favorites() are
+    small transactional writes used for single user actions.
+    """
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS businesses (
+        id INTEGER PRIMARY KEY,
+        position INTEGER NOT NULL,
+        external_id TEXT,
+        name TEXT NOT NULL DEFAULT '',
+        category TEXT NOT NULL DEFAULT '',
+        address TEXT NOT NULL DEFAULT '',
+        deal TEXT NOT NULL DEFAULT '',
+        extra_ratings TEXT NOT NULL DEFAULT '[]',
+        avg_rating REAL NOT NULL DEFAULT 0,
+        review_count INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS reviews (
+        review_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        business_id INTEGER NOT NULL REFERENCES businesses(id) ON DELETE CASCADE,
+        rating INTEGER NOT NULL,
+        text TEXT NOT NULL DEFAULT '',
+        timestamp REAL NOT NULL,
+        source TEXT NOT NULL DEFAULT ''
+    );
+    CREATE TABLE IF NOT EXISTS favorites (key TEXT PRIMARY KEY);
+    CREATE INDEX IF NOT EXISTS idx_businesses_name ON businesses(name);
+    CREATE INDEX IF NOT EXISTS idx_businesses_category ON businesses(category);
+    CREATE INDEX IF NOT EXISTS idx_businesses_external_id ON businesses(external_id);
+    CREATE INDEX IF NOT EXISTS idx_businesses_rating ON businesses(avg_rating);
+    CREATE INDEX IF NOT EXISTS idx_reviews_business ON reviews(business_id);
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM businesses LIMIT 1").fetchone() is None
+
+    @staticmethod
+    def _aggregates(entry: Dict) -> tuple:
+        ratings = [r.get("rating", 0) for r in entry.get("reviews", []) if isinstance(r, dict)]
+        extra = list(entry.get("extra_ratings") or [])
+        count = len(ratings) + sum(extra)
+        total = sum(ratings) + sum(star * n for star, n in enumerate(extra, 1))
+        return (total / count if count else 0.0), count
+
+    def load(self) -> Dict:
+        """Return the dataset in the same raw dict shape as the JSON file."""
+        with self._lock:
+            businesses = []
+            by_id = {}
+            for row in self.conn.execute(
+                    "SELECT id, external_id, name, category, address, deal, extra_ratings FROM businesses ORDER BY position"):
+                entry = {"id": row[0], "name": row[2], "category": row[3], "address": row[4], "deal": row[5], "reviews": []}
+                if row[1]:
+                    entry["external_id"] = row[1]
+                extra = json.loads(row[6] or "[]")
+                if extra:
+                    entry["extra_ratings"] = extra
+                businesses.append(entry)
+                by_id[row[0]] = entry
+            for bid, rating, text, ts, source in self.conn.execute(
+                    "SELECT business_id, rating, text, timestamp, source FROM reviews ORDER BY review_id"):
+                entry = by_id.get(bid)
+                if entry is not None:
+                    review = {"rating": rating, "text": text, "timestamp": ts}
+                    if source:
+                        review["source"] = source
+                    entry["reviews"].append(review)
+            favorites = [row[0] for row in self.conn.execute("SELECT key FROM favorites")]
+        return {"businesses": businesses, "favorites": favorites}
+
+    def save(self, data: Dict) -> None:
+        """Replace the stored dataset with data in a single transaction."""
+        rows, reviews = [], []
+        for pos, b in enumerate(data.get("businesses", [])):
+            if not isinstance(b, dict):
+                continue
+            avg, count = self._aggregates(b)
+            rows.append((b.get("id"), pos, b.get("external_id") or None, b.get("name", "") or "", b.get("category", "") or "",
+                         b.get("address", "") or "", b.get("deal", "") or "", json.dumps(b.get("extra_ratings") or []), avg, count))
+            for r in b.get("reviews", []):
+                if isinstance(r, dict):
+                    reviews.append((b.get("id"), r.get("rating", 0), r.get("text", ""), r.get("timestamp", time.time()), r.get("source", "")))
+        favorites = [(str(k),) for k in set(data.get("favorites", []))]
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM reviews")
+            self.conn.execute("DELETE FROM businesses")
+            self.conn.execute("DELETE FROM favorites")
+            self.conn.executemany("INSERT OR REPLACE INTO businesses VALUES (?,?,?,?,?,?,?,?,?,?)", rows)
+            self.conn.executemany("INSERT INTO reviews (business_id, rating, text, timestamp, source) VALUES (?,?,?,?,?)", reviews)
+            self.conn.executemany("INSERT OR IGNORE INTO favorites VALUES (?)", favorites)
+
+    def add_review(self, business_id: int, review: Dict) -> None:
+        """Insert one review and refresh the business's rating aggregates in one transaction."""
+        with self._lock, self.conn:
+            self.conn.execute("INSERT INTO reviews (business_id, rating, text, timestamp, source) VALUES (?,?,?,?,?)",
+                              (business_id, review.get("rating", 0), review.get("text", ""),
+                               review.get("timestamp", time.time()), review.get("source", "")))
+            self.conn.execute("""
+                UPDATE businesses SET
+                    review_count = review_count + 1,
+                    avg_rating = (avg_rating * review_count + ?) / (review_count + 1)
+                WHERE id = ?""", (review.get("rating", 0), business_id))
+
+    def set_favorites(self, keys) -> None:
+        """Make the favorites table equal to keys, touching only the rows that differ."""
+        keys = {str(k) for k in keys}
+        with self._lock, self.conn:
+            current = {row[0] for row in self.conn.execute("SELECT key FROM favorites")}
+            self.conn.executemany("DELETE FROM favorites WHERE key = ?", [(k,) for k in current - keys])
+            self.conn.executemany("INSERT OR IGNORE INTO favorites VALUES (?)", [(k,) for k in keys - current])
+
+_sqlite_store: Optional[SqliteStore] = None
+
+def get_sqlite_store() -> SqliteStore:
+    global _sqlite_store
+    if _sqlite_store is None:
+        _sqlite_store = SqliteStore(SQLITE_FILE)
+    return _sqlite_store
+
+def data_store_exists() -> bool:
+    """True if the active backend already holds saved data."""
+    if STORAGE_BACKEND == "sqlite":
+        return os.path.exists(SQLITE_FILE) and not get_sqlite_store().is_empty()
+    return os.path.exists(DATA_FILE)
+
+def save_data(data) -> bool:
+    """Persist the whole dataset to the active backend (DATA_FILE or SQLITE_FILE). Returns True on success."""
+    if STORAGE_BACKEND == "sqlite":
+        try:
+            get_sqlite_store().save(data)
+            return True
+        except Exception as e:
+            log(f"SQLite save failed: {e}", logging.ERROR)
+            return False
+    with _journal_lock:
+        if not _save_json_data(data, _clear_journal_after_snapshot()):
+            return False
+        _remove_journal_files()
+        return True
+
+class SaveScheduler:
+    """Coalesces save requests and writes them on a background thread.
+    A write happens once no request has arrived for `debounce` seconds, or `max_delay` seconds after the
+    first pending request, whichever comes first. Only the most recent data passed to request() is written.
+    """
+
+    def __init__(self, writer=None, debounce: float = None, max_delay: float = None):
+        self._writer = writer or save_data
+        self.debounce = SAVE_DEBOUNCE_SECONDS if debounce is None else debounce
+        self.max_delay = SAVE_MAX_DELAY_SECONDS if max_delay is None else max_delay
+        self._cond = threading.Condition()
+        self._pending = None
+        self._first = 0.0
+        self._last = 0.0
+        self._writing = False
+        self._thread = None
+
+    def request(self, data) -> None:
+        with self._cond:
+            now = time.monotonic()
+            if self._pending is None:
+                self._first = now
+            self._pending = data
+            self._last = now
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="save-scheduler", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    @property
+    def dirty(self) -> bool:
+        with self._cond:
+            return self._pending is not None or self._writing
+
+    def _write(self, data, retry: bool) -> None:
+        ok = False
+        try:
+            ok = self._writer(data)
+        except Exception as e:
+            log(f"Scheduled save failed: {e}", logging.ERROR)
+        with self._cond:
+            self._writing = False
+            if not ok and retry and self._pending is None:
+                # e.g. a transient I/O error; try once more
+                self._pending = data
+                self._first = self._last = time.monotonic()
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._pending is None:
+                        self._cond.wait()
+                        continue
+                    due = min(self._last + self.debounce, self._first + self.max_delay)
+                    now = time.monotonic()
+                    if now >= due and not self._writing:
+                        break
+                    self._cond.wait(max(due - now, 0.01))
+                data, self._pending = self._pending, None
+                self._writing = True
+            self._write(data, retry=True)
+
+    def flush(self) -> None:
+        """Write any pending data now on the calling thread (after an in-flight write finishes)."""
+        with self._cond:
+            while self._writing:
+                self._cond.wait()
+            data, self._pending = self._pending, None
+            if data is None:
+                return
+            self._writing = True
+        self._write(data, retry=False)
+
+_save_scheduler = SaveScheduler()
+
+def _save_snapshot(data):
+    """Copy of data for the save worker, taken on the calling thread. Only the containers are copied:
+    business entries are copy-on-write (see _encode_entries), so later edits to data never reach the copy."""
+    if not isinstance(data, dict):
+        return data
+    snapshot = dict(data)
+    for key in ("businesses", "favorites"):
+        if isinstance(snapshot.get(key), list):
+            snapshot[key] = list(snapshot[key])
+    return snapshot
+
+def request_save(data) -> None:
+    """Mark data dirty; the save scheduler writes a snapshot of it off the calling thread after the debounce window."""
+    _save_scheduler.request(_save_snapshot(data))
+
+def flush_saves() -> None:
+    """Synchronously write any save still waiting in the scheduler (used on exit and by Save Now)."""
+    _save_scheduler.flush()
+
+atexit.register(flush_saves)
+
+def load_data():
+    """Load the dataset from the active backend. An empty SQLite store is seeded from the JSON file."""
+    if STORAGE_BACKEND == "sqlite":
+        try:
+            store = get_sqlite_store()
+            if store.is_empty():
+                data = replay_journal(*_load_json_store())
+                store.save(data)
+                return data
+            data = store.load()
+            if not data["businesses"]:
+                data = default_data(); store.save(data)
+            return data
+        except Exception as e:
+            log(f"SQLite load failed, using JSON: {e}", logging.ERROR)
+    return replay_journal(*_load_json_store())
+
+def export_data_json(data, path: str = DATA_FILE) -> None:
+    """Write data as pretty-printed JSON (the import/export format for either backend)."""
+    os.replace(_write_json_temp(path, data), path)
+
+def save_favorites(raw, fav_keys, businesses=None) -> None:
+    """Record the favorites set. SQLite writes only the changed favorite rows; JSON appends the diff to the journal."""
+    # a delayed full save must land first, or it would be replayed against / overwrite this newer write
+    flush_saves()
+    previous = set(raw.get("favorites", []))
+    raw["favorites"] = list(fav_keys)
+    if businesses is not None:
+        persist_businesses(raw, businesses)
+    if STORAGE_BACKEND == "sqlite":
+        try:
+            get_sqlite_store().set_favorites(raw["favorites"])
+            return
+        except Exception as e:
+            log(f"SQLite favorite write failed: {e}", logging.ERROR)
+    else:
+        current = set(raw["favorites"])
+        if current == previous or append_journal({"op": "favorites", "add": sorted(current - previous),
+                                                  "remove": sorted(previous - current)}):
+            return
+    request_save(raw)
+
+def save_review(raw, business, review) -> None:
+    """Record a review just appended to business.reviews (a single row in SQLite, a journal entry for JSON)."""
+    flush_saves()
+    if STORAGE_BACKEND == "sqlite":
+        try:
+            get_sqlite_store().add_review(business.id, review.to_dict())
+        except Exception as e:
+            log(f"SQLite review write failed: {e}", logging.ERROR)
+    else:
+        append_journal({"op": "review", "id": business.id, "review": review.to_dict()})
+
 def build_businesses(raw):
     out = []
-    for b in raw.get("businesses", []):
-        if isinstance(b, Business): out.append(b); continue
-        if not isinstance(b, dict): continue
-        reviews = [Review(r.get("rating",0), r.get("text",""), r.get("timestamp",time.time())) for r in b.get("reviews", []) if isinstance(r, dict)]
-        out.append(Business(b.get("id",0), b.get("name",""), b.get("category",""), b.get("address",""), b.get("deal",""), reviews))
+    with _gc_paused():
+        for b in raw.get("businesses", []):
+            if isinstance(b, Business): out.append(b); continue
+            if not isinstance(b, dict): continue
+            business = Business(b.get("id",0), b.get("name",""), b.get("category",""), b.get("address",""), b.get("deal",""), None,
+                                b.get("external_id") or "", list(b.get("extra_ratings") or []))
+            source = b.get("reviews") or []
+            if source:
+                business._review_source = source
+                business._stats = _review_stats(source)
+            # the raw dict is the business's serialized form until something changes
+            business._entry = b
+            business._entry_reviews = -1 if source else 0
+            out.append(business)
     return out
 
+def _business_entry(b: Business) -> Dict:
+    """Return b as a raw dict, reusing the cached one unless a field was assigned or reviews were added."""
+    reviews_len = len(b._reviews) if b.reviews_loaded else -1
+    entry = b._entry
+    if entry is not None and b._entry_reviews == reviews_len:
+        return entry
+    entry = {}
+    for name in Business.FIELDS:
+        if name == "reviews":
+            entry["reviews"] = _business_review_dicts(b)
+        else:
+            value = getattr(b, name)
+            entry[name] = list(value) if isinstance(value, list) else value
+    b._entry = entry
+    b._entry_reviews = reviews_len
+    return entry
+
 def persist_businesses(raw, businesses):
-    raw["businesses"] = [asdict(b) for b in businesses]
+    """Write businesses back into raw['businesses']; only changed businesses are re-serialized."""
+    raw["businesses"] = [_business_entry(b) for b in businesses]
+
+def _address_city(address: str) -> str:
+    """City part of an address built as "street, city" (empty when there is no comma)."""
+    head, sep, tail = (address or "").rpartition(",")
+    return tail.strip().lower() if sep else ""
+
+def _dictionary_encode(values) -> tuple:
+    """Return (array of int codes, list of distinct interned values) for an iterable of strings."""
+    lookup: Dict[str, int] = {}
+    distinct: List[str] = []
+    codes = array("l")
+    for v in values:
+        code = lookup.get(v)
+        if code is None:
+            code = lookup[v] = len(distinct)
+            distinct.append(sys.intern(v))
+        codes.append(code)
+    return codes, distinct
+
+class BusinessTable:
+    """Columnar view of a business list: ratings, review counts, chain flags and dictionary-encoded
+    name/category/city columns in parallel arrays. Filters are evaluated as whole-column masks
+    (string predicates run once per distinct value) and return row indexes into `businesses`.
+    Uses NumPy when installed.
+    """
 
-def import_yelp_academic_businesses(path, city_filter="", limit=500, category_filter=None):
-    res = []
-    city_filter = city_filter.lower().strip()
-    log_path = os.path.expanduser("~/yelp_debug.log")
-    with open(path, "r", encoding="utf-8") as f, open(log_path, "a", encoding="utf-8") as logf:
-        for line in f:
-            try:
-                obj = json.loads(line)
-            except:
-                continue
-            name = obj.get("name", "").lower().strip()
-            if is_big_chain(name):
-                continue 
-            city_val = obj.get("city", "").lower().strip()
-            logf.write(f"Loaded: {obj.get('name','')} | City: {city_val} | Categories: {obj.get('categories','')}\n")
-            if city_filter and city_filter not in city_val:
+    def __init__(self, businesses: List[Business]):
+        self.businesses = businesses
+        self.ratings = array("d", [b.avg_rating() for b in businesses])
+        self.review_counts = array("l", [b.review_count() for b in businesses])
+        self.name_codes, self.names = _dictionary_encode(b.name or "" for b in businesses)
+        self.category_codes, self.categories = _dictionary_encode(b.category or "" for b in businesses)
+        self.city_codes, self.cities = _dictionary_encode(_address_city(b.address) for b in businesses)
+        chain_by_name = is_big_chain_many(self.names)
+        self.chain_flags = array("b", [chain_by_name[c] for c in self.name_codes])
+        self._encode_category_tokens()
+
+    def _encode_category_tokens(self) -> None:
+        """Split each distinct category string once into interned token ids ("Food, Pizza" -> ids of "Food", "Pizza").
+        Per-token posting lists of rows are built on first use (see category_postings)."""
+        token_ids: Dict[str, int] = {}
+        self.category_tokens: List[str] = []
+        self.category_token_ids: List[tuple] = []
+        for category in self.categories:
+            ids = []
+            for part in category.split(","):
+                token = part.strip()
+                tid = token_ids.get(token)
+                if tid is None:
+                    tid = token_ids[token] = len(self.category_tokens)
+                    self.category_tokens.append(sys.intern(token))
+                ids.append(tid)
+            self.category_token_ids.append(tuple(ids))
+        self._category_postings = None
+
+    def __len__(self):
+        # rows in the columns, not len(self.businesses): the list may be appended to after the table was built,
+        # and callers compare the two to decide when to rebuild
+        return len(self.ratings)
+
+    @staticmethod
+    def _column(col):
+        return np.frombuffer(col, dtype={"d": np.float64, "l": np.dtype("l"), "b": np.int8}[col.typecode])
+
+    def _code_mask(self, codes, distinct, predicate):
+        lut = [bool(predicate(v)) for v in distinct]
+        if NUMPY_AVAILABLE:
+            return np.asarray(lut, dtype=bool)[self._column(codes)] if len(codes) else np.zeros(0, dtype=bool)
+        return [lut[c] for c in codes]
+
+    @property
+    def category_postings(self) -> List[array]:
+        """For each category token id, the rows whose category contains it (once per occurrence)."""
+        if self._category_postings is None:
+            postings = [array("l") for _ in self.category_tokens]
+            token_ids = self.category_token_ids
+            for row, code in enumerate(self.category_codes):
+                for tid in token_ids[code]:
+                    postings[tid].append(row)
+            self._category_postings = postings
+        return self._category_postings
+
+    def category_counts(self, lower: bool = False) -> Dict[str, int]:
+        """{token: number of businesses listing it} in first-seen order (like a Counter over every split
+        category), read from the posting list lengths. lower=True merges tokens case-insensitively."""
+        counts: Dict[str, int] = {}
+        for token, rows in zip(self.category_tokens, self.category_postings):
+            key = token.lower() if lower else token
+            counts[key] = counts.get(key, 0) + len(rows)
+        return counts
+
+    def _token_mask(self, predicate):
+        """Union of the posting lists of every category token satisfying predicate, as a row mask."""
+        postings = [rows for token, rows in zip(self.category_tokens, self.category_postings) if predicate(token)]
+        n = len(self.businesses)
+        if NUMPY_AVAILABLE:
+            mask = np.zeros(n, dtype=bool)
+            for rows in postings:
+                if len(rows):
+                    mask[self._column(rows)] = True
+            return mask
+        mask = bytearray(n)
+        for rows in postings:
+            for row in rows:
+                mask[row] = 1
+        return mask
+
+    def filter(self, min_rating: Optional[float] = None, round_rating: bool = False, category=None, name=None,
+               city=None, exclude_chains: bool = False, category_token=None) -> List[int]:
+        """Row indexes (in order) passing every given condition. category/name/city are predicates on the
+        raw category, name and lower-cased city strings; category_token is a predicate on single category
+        tokens (a row matches if any of its tokens does); min_rating compares the (optionally rounded) average."""
+        masks = []
+        if min_rating is not None:
+            if NUMPY_AVAILABLE:
+                ratings = self._column(self.ratings)
+                masks.append((np.round(ratings) if round_rating else ratings) >= min_rating)
+            else:
+                masks.append([(round(r) if round_rating else r) >= min_rating for r in self.ratings])
+        if category is not None:
+            masks.append(self._code_mask(self.category_codes, self.categories, category))
+        if category_token is not None:
+            masks.append(self._token_mask(category_token))
+        if name is not None:
+            masks.append(self._code_mask(self.name_codes, self.names, name))
+        if city is not None:
+            masks.append(self._code_mask(self.city_codes, self.cities, city))
+        if exclude_chains:
+            masks.append(self._column(self.chain_flags) == 0 if NUMPY_AVAILABLE else [not f for f in self.chain_flags])
+        if not masks:
+            return list(range(len(self.businesses)))
+        if NUMPY_AVAILABLE:
+            combined = masks[0]
+            for m in masks[1:]:
+                combined = combined & m
+            return np.flatnonzero(combined).tolist()
+        return [i for i, keep in enumerate(zip(*masks)) if all(keep)]
+
+    def rows(self, indexes) -> List[Business]:
+        businesses = self.businesses
+        return [businesses[i] for i in indexes]
+
+    def argsort_rating(self, descending: bool = True) -> List[int]:
+        """Row order by average rating; ties keep their current order (like a stable list.sort)."""
+        if NUMPY_AVAILABLE:
+            ratings = self._column(self.ratings)
+            return np.argsort(-ratings if descending else ratings, kind="stable").tolist()
+        return sorted(range(len(self.ratings)), key=self.ratings.__getitem__, reverse=descending)
+
+    def take(self, indexes) -> "BusinessTable":
+        """A new table with rows reordered/subset by indexes (no recomputation of ratings or codes)."""
+        table = BusinessTable.__new__(BusinessTable)
+        table.businesses = self.rows(indexes)
+        for attr in ("ratings", "review_counts", "name_codes", "category_codes", "city_codes", "chain_flags"):
+            col = getattr(self, attr)
+            setattr(table, attr, array(col.typecode, [col[i] for i in indexes]))
+        table.names, table.categories, table.cities = self.names, self.categories, self.cities
+        table.category_tokens, table.category_token_ids = self.category_tokens, self.category_token_ids
+        table._category_postings = None
+        return table
+
+# Inverted word index over business name/category/address for multi-term prefix search
+SEARCH_FIELD_NAME, SEARCH_FIELD_CATEGORY, SEARCH_FIELD_ADDRESS = 1, 2, 4
+SEARCH_ALL_FIELDS = SEARCH_FIELD_NAME | SEARCH_FIELD_CATEGORY | SEARCH_FIELD_ADDRESS
+LIVE_FILTER_DEBOUNCE_MS = 150   # quiet time after a keystroke before the live filter runs
+LIVE_FILTER_MAX_ROWS = 500      # live filter renders at most this many (best) rows
+# score of a term hit per field; an exact word hit counts double a prefix hit
+_SEARCH_FIELD_WEIGHTS = ((SEARCH_FIELD_NAME, 3.0), (SEARCH_FIELD_CATEGORY, 2.0), (SEARCH_FIELD_ADDRESS, 1.0))
+_SEARCH_WORD_RE = re.compile(r"[^\W_]+")
+
+def search_terms(text: str) -> List[str]:
+    """Lower-cased words of text (letters/digits), in order."""
+    return _SEARCH_WORD_RE.findall((text or "").lower())
+
+class SearchIndex:
+    """Word -> {business id: field bits} postings over name, category and address, with prefix lookup
+    through a sorted vocabulary. sync() updates only businesses whose indexed text changed, so the index
+    follows imports, edits and list rebuilds without re-tokenizing everything. Updates and match() hold
+    an internal lock, so a match may run on a worker thread while the GUI thread syncs.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.docs: Dict[int, tuple] = {}        # id -> (name, category, address) as indexed
+        self.businesses: Dict[int, Business] = {}
+        self._vocab: List[str] = []
+        self._vocab_dirty = False
+        self.version = 0                        # bumped whenever indexed text changes
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.docs)
+
+    def _words(self, doc: tuple) -> Dict[str, int]:
+        words: Dict[str, int] = {}
+        for field_bit, text in zip((SEARCH_FIELD_NAME, SEARCH_FIELD_CATEGORY, SEARCH_FIELD_ADDRESS), doc):
+            for word in search_terms(text):
+                words[word] = words.get(word, 0) | field_bit
+        return words
+
+    def add(self, b: Business) -> None:
+        doc = (b.name or "", b.category or "", b.address or "")
+        with self._lock:
+            if self.docs.get(b.id) == doc:
+                self.businesses[b.id] = b
+                return
+            self.remove(b.id)
+            self.docs[b.id] = doc
+            self.businesses[b.id] = b
+            self.version += 1
+            for word, bits in self._words(doc).items():
+                posting = self.postings.get(word)
+                if posting is None:
+                    posting = self.postings[word] = {}
+                    self._vocab_dirty = True
+                posting[b.id] = bits
+
+    def remove(self, bid: int) -> None:
+        with self._lock:
+            doc = self.docs.pop(bid, None)
+            self.businesses.pop(bid, None)
+            if doc is None:
+                return
+            self.version += 1
+            for word in self._words(doc):
+                posting = self.postings.get(word)
+                if posting is not None:
+                    posting.pop(bid, None)
+                    if not posting:
+                        del self.postings[word]
+                        self._vocab_dirty = True
+
+    def sync(self, businesses: List[Business]) -> None:
+        """Make the index describe exactly `businesses` (by id), re-indexing only changed records."""
+        with self._lock:
+            seen = set()
+            for b in businesses:
+                seen.add(b.id)
+                self.add(b)
+            for bid in [bid for bid in self.docs if bid not in seen]:
+                self.remove(bid)
+
+    def _words_with_prefix(self, prefix: str) -> List[str]:
+        if self._vocab_dirty:
+            self._vocab = sorted(self.postings)
+            self._vocab_dirty = False
+        vocab = self._vocab
+        out = []
+        for i in range(bisect.bisect_left(vocab, prefix), len(vocab)):
+            if not vocab[i].startswith(prefix):
+                break
+            out.append(vocab[i])
+        return out
+
+    def match(self, query: str, fields: int = SEARCH_ALL_FIELDS, candidates: Optional[Iterable[int]] = None,
+              cancel: Optional[threading.Event] = None) -> Optional[Dict[int, float]]:
+        """{business id: score} for businesses where every query word prefixes a word in one of `fields`.
+        Returns None for a query without words (i.e. no constraint). `candidates` restricts the result to
+        those ids (e.g. the hits of a shorter query being typed); a set `cancel` event stops early with {},
+        so callers must discard the result of a cancelled match."""
+        terms = search_terms(query)
+        if not terms:
+            return None
+        with self._lock:
+            return self._match(terms, fields, candidates, cancel)
+
+    def _match(self, terms: List[str], fields: int, candidates: Optional[Iterable[int]],
+               cancel: Optional[threading.Event]) -> Dict[int, float]:
+        expanded = []
+        for term in dict.fromkeys(terms):
+            words = self._words_with_prefix(term)
+            expanded.append((sum(len(self.postings[w]) for w in words), term, words))
+        # rarest term first; later terms only look up the surviving candidates when that is cheaper
+        expanded.sort(key=lambda e: e[0])
+        result: Optional[Dict[int, float]] = None if candidates is None else dict.fromkeys(candidates, 0.0)
+        for size, term, words in expanded:
+            if cancel is not None and cancel.is_set():
+                return {}
+            if result is not None and len(result) * len(words) < size:
+                candidates = result.keys()
+                postings = [(2.0 if w == term else 1.0, self.postings[w]) for w in words]
+                hits = {}
+                for bid in candidates:
+                    best = 0.0
+                    for factor, posting in postings:
+                        bits = posting.get(bid, 0) & fields
+                        if bits:
+                            best = max(best, factor * max(w for bit, w in _SEARCH_FIELD_WEIGHTS if bits & bit))
+                    if best:
+                        hits[bid] = best
+            else:
+                hits = {}
+                for word in words:
+                    factor = 2.0 if word == term else 1.0
+                    for bid, bits in self.postings[word].items():
+                        bits &= fields
+                        if not bits:
+                            continue
+                        score = factor * max(w for bit, w in _SEARCH_FIELD_WEIGHTS if bits & bit)
+                        if score > hits.get(bid, 0.0):
+                            hits[bid] = score
+            result = hits if result is None else {bid: sc + hits[bid] for bid, sc in result.items() if bid in hits}
+            if not result:
+                return {}
+        return result
+
+    def search(self, query: str, fields: int = SEARCH_ALL_FIELDS, limit: Optional[int] = None) -> List[Business]:
+        """Businesses matching every word of query, best first (score, then average rating)."""
+        scores = self.match(query, fields)
+        if scores is None:
+            return list(self.businesses.values())[:limit]
+        ranked = sorted(scores, key=lambda bid: (-scores[bid], -self.businesses[bid].avg_rating()))
+        return [self.businesses[bid] for bid in ranked[:limit]]
+
+# Trigram index for typo-tolerant name search
+FUZZY_MIN_SIMILARITY = 0.3
+FUZZY_TOP_K = 20
+
+def trigrams(word: str) -> frozenset:
+    """Trigrams of one word, padded like pg_trgm ("joe" -> "  j", " jo", "joe", "oe ")."""
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+class TrigramIndex:
+    """Trigram -> {word} postings over the words of one Business attribute ("name" or "address").
+    Each query word is compared (Jaccard index of trigram sets) only with indexed words sharing a trigram
+    with it; a business scores the mean, over the query words, of its best-matching word.
+    """
+
+    def __init__(self, attr: str = "name"):
+        self.attr = attr
+        self.postings: Dict[str, set] = {}
+        self.grams: Dict[str, frozenset] = {}     # word -> its trigrams
+        self.owners: Dict[str, set] = {}          # word -> ids of businesses using it
+        self.words: Dict[int, tuple] = {}         # business id -> its indexed words
+        self.businesses: Dict[int, Business] = {}
+
+    def __len__(self):
+        return len(self.words)
+
+    def add(self, b: Business) -> None:
+        words = tuple(dict.fromkeys(search_terms(getattr(b, self.attr, "") or "")))
+        if self.words.get(b.id) == words:
+            self.businesses[b.id] = b
+            return
+        self.remove(b.id)
+        self.words[b.id] = words
+        self.businesses[b.id] = b
+        for word in words:
+            owners = self.owners.get(word)
+            if owners is None:
+                owners = self.owners[word] = set()
+                grams = self.grams[word] = trigrams(word)
+                for gram in grams:
+                    self.postings.setdefault(gram, set()).add(word)
+            owners.add(b.id)
+
+    def remove(self, bid: int) -> None:
+        words = self.words.pop(bid, None)
+        self.businesses.pop(bid, None)
+        for word in words or ():
+            owners = self.owners[word]
+            owners.discard(bid)
+            if owners:
                 continue
-            # Improved category filtering
-            if category_filter:
-                cats = obj.get("categories", "")
-                cat_list = [c.strip().lower() for c in cats.split(",") if c.strip()]
-                filter_val = category_filter.lower().strip()
-                if not any(filter_val in c for c in cat_list):
+            del self.owners[word]
+            for gram in self.grams.pop(word):
+                posting = self.postings[gram]
+                posting.discard(word)
+                if not posting:
+                    del self.postings[gram]
+
+    def sync(self, businesses: List[Business]) -> None:
+        """Make the index describe exactly `businesses` (by id), re-indexing only changed records."""
+        seen = set()
+        for b in businesses:
+            seen.add(b.id)
+            self.add(b)
+        for bid in [bid for bid in self.words if bid not in seen]:
+            self.remove(bid)
+
+    def _similar_words(self, word: str, min_similarity: float) -> Dict[str, float]:
+        query_grams = trigrams(word)
+        shared: Dict[str, int] = {}
+        for gram in query_grams:
+            for other in self.postings.get(gram, ()):
+                shared[other] = shared.get(other, 0) + 1
+        nq = len(query_grams)
+        out = {}
+        for other, common in shared.items():
+            sim = common / (nq + len(self.grams[other]) - common)
+            if sim >= min_similarity:
+                out[other] = sim
+        return out
+
+    def similar(self, query: str, k: int = FUZZY_TOP_K, min_similarity: float = FUZZY_MIN_SIMILARITY) -> List[tuple]:
+        """Up to k (similarity, business) pairs with similarity >= min_similarity, most similar first."""
+        query_words = list(dict.fromkeys(search_terms(query)))
+        if not query_words:
+            return []
+        totals: Dict[int, float] = {}
+        for word in query_words:
+            best: Dict[int, float] = {}
+            for other, sim in self._similar_words(word, min_similarity).items():
+                for bid in self.owners[other]:
+                    if sim > best.get(bid, 0.0):
+                        best[bid] = sim
+            for bid, sim in best.items():
+                totals[bid] = totals.get(bid, 0.0) + sim
+        n = len(query_words)
+        scores = {bid: total / n for bid, total in totals.items()}
+        if n > 1:
+            # "cheese steak" should still find "Cheesesteak": also try the query words run together
+            for other, sim in self._similar_words("".join(query_words), min_similarity).items():
+                for bid in self.owners[other]:
+                    if sim > scores.get(bid, 0.0):
+                        scores[bid] = sim
+        scored = [(sim, -bid) for bid, sim in scores.items() if sim >= min_similarity]
+        return [(sim, self.businesses[-neg_bid]) for sim, neg_bid in heapq.nlargest(k, scored)]
+
+# Persistent offset index over the Yelp business file (normalized city/category -> byte offsets)
+CACHE_DIR = os.path.expanduser("~/.business_app_cache")
+YELP_INDEX_MAGIC = b"LLYIDX01"
+# magic, source size, source mtime (ns), directory length
+_YELP_INDEX_HEADER = struct.Struct("<8sQqI")
+
+def _file_identity(path):
+    """Return (size, mtime_ns) for path, or None if the file cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+        return (st.st_size, st.st_mtime_ns)
+    except Exception:
+        return None
+
+def _cache_path_for(path: str, suffix: str) -> str:
+    """Return a file path inside CACHE_DIR that is unique to the given source file."""
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"{os.path.basename(path) or 'data'}.{digest}{suffix}")
+
+YELP_GEO_INDEX_MAGIC = b"LLYGEO01"
+# grid cell size of the spatial index in degrees (~5.5 km of latitude)
+YELP_GEO_CELL_DEG = 0.05
+# latitude, longitude, byte offset of the record's line
+_YELP_GEO_RECORD = struct.Struct("<ddQ")
+
+def _yelp_index_data_start(dir_len: int) -> int:
+    """Offset of the packed data array (8-byte aligned after the directory)."""
+    end = _YELP_INDEX_HEADER.size + dir_len
+    return (end + 7) & ~7
+
+def _write_mapped_index(index_path: str, magic: bytes, ident, directory: Dict, data: bytes) -> bool:
+    """Write header + JSON directory + aligned data block to index_path via a temp file and rename."""
+    blob = json.dumps(directory, ensure_ascii=False).encode("utf-8")
+    header = _YELP_INDEX_HEADER.pack(magic, ident[0], ident[1], len(blob))
+    padding = b"\0" * (_yelp_index_data_start(len(blob)) - len(header) - len(blob))
+    tmp_path = index_path + ".tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "wb") as out:
+            out.write(header)
+            out.write(blob)
+            out.write(padding)
+            out.write(data)
+        os.replace(tmp_path, index_path)
+        return True
+    except Exception as e:
+        log(f"Index write failed for {index_path}: {e}")
+        return False
+
+def _geo_cell(lat: float, lon: float):
+    return (int(lat // YELP_GEO_CELL_DEG), int(lon // YELP_GEO_CELL_DEG))
+
+def build_yelp_index(path: str) -> Optional[str]:
+    """Scan the Yelp JSON-lines file once and write both indexes to CACHE_DIR:
+    a city/category offset index (.lidx) and a latitude/longitude grid (.lgeo).
+    Returns the .lidx path, or None if the source could not be read.
+    """
+    ident = _file_identity(path)
+    if ident is None:
+        return None
+    cities: Dict[str, List[int]] = {}
+    categories: Dict[str, List[int]] = {}
+    cells: Dict[tuple, List[tuple]] = {}
+    try:
+        with open(path, "rb") as f:
+            offset = 0
+            for line in f:
+                start = offset
+                offset += len(line)
+                try:
+                    obj = _json_loads(line)
+                except Exception:
+                    continue
+                if not isinstance(obj, dict):
                     continue
-            # Add Yelp review as a Review dict
-            stars = obj.get("stars", None)
-            yelp_review = []
-            if stars is not None:
+                city = str(obj.get("city") or "").lower().strip()
+                cities.setdefault(city, []).append(start)
+                for cat in str(obj.get("categories") or "").split(","):
+                    cat = cat.strip().lower()
+                    if cat:
+                        categories.setdefault(cat, []).append(start)
                 try:
-                    stars_int = int(round(float(stars)))
+                    lat, lon = float(obj["latitude"]), float(obj["longitude"])
                 except Exception:
-                    stars_int = 0
-                yelp_review = [{
-                    "rating": stars_int,
-                    "text": "Imported from Yelp (Yelp average rating)",
-                    "timestamp": time.time()
-                }]
-            res.append({
-                "external_id": obj.get("business_id"),
-                "name": obj.get("name", ""),
-                "category": obj.get("categories", ""),
-                "address": f"{obj.get('address','')}, {obj.get('city','')}",
-                "deal": "",
-                "reviews": yelp_review
-            })
-            if len(res) >= limit:
+                    continue
+                cells.setdefault(_geo_cell(lat, lon), []).append((lat, lon, start))
+    except Exception as e:
+        log(f"Yelp index build failed for {path}: {e}")
+        return None
+
+    offsets = array("Q")
+    directory = {"city": {}, "category": {}}
+    for section, table in (("city", cities), ("category", categories)):
+        for key, offs in table.items():
+            directory[section][key] = [len(offsets), len(offs)]
+            offsets.extend(offs)
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    index_path = _cache_path_for(path, ".lidx")
+
+    geo_dir = {"cell_deg": YELP_GEO_CELL_DEG, "cells": {}}
+    geo_data = bytearray()
+    count = 0
+    for (ci, cj), records in cells.items():
+        geo_dir["cells"][f"{ci},{cj}"] = [count, len(records)]
+        for rec in records:
+            geo_data += _YELP_GEO_RECORD.pack(*rec)
+        count += len(records)
+
+    # geo index first: get_yelp_index() treats a fresh .lidx as "both indexes are built"
+    if not _write_mapped_index(_cache_path_for(path, ".lgeo"), YELP_GEO_INDEX_MAGIC, ident, geo_dir, bytes(geo_data)):
+        return None
+    if not _write_mapped_index(index_path, YELP_INDEX_MAGIC, ident, directory, offsets.tobytes()):
+        return None
+    log(f"Built Yelp index {index_path} ({len(cities)} cities, {len(categories)} categories, {len(cells)} geo cells)")
+    return index_path
+
+class _MappedIndex:
+    """Read-only, memory-mapped view of a file written by _write_mapped_index()."""
+    MAGIC = b""
+
+    def __init__(self, index_path: str):
+        self._file = open(index_path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self.source_size, self.source_mtime_ns, dir_len = _YELP_INDEX_HEADER.unpack_from(self._mm, 0)
+            if magic != self.MAGIC:
+                raise ValueError(f"{index_path} is not a {type(self).__name__} file")
+            start = _YELP_INDEX_HEADER.size
+            self.directory = json.loads(self._mm[start:start + dir_len].decode("utf-8"))
+            self._data_start = _yelp_index_data_start(dir_len)
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        try:
+            self._mm.close()
+        except Exception:
+            pass
+        try:
+            self._file.close()
+        except Exception:
+            pass
+
+class YelpIndex(_MappedIndex):
+    """City/category -> line offset index written by build_yelp_index()."""
+    MAGIC = YELP_INDEX_MAGIC
+
+    def _offsets_matching(self, section: str, needle: str) -> set:
+        """Union of offsets for every key in section that contains needle (same substring rule as the importer)."""
+        out = set()
+        for key, (start, count) in self.directory.get(section, {}).items():
+            if needle in key:
+                out.update(struct.unpack_from(f"<{count}Q", self._mm, self._data_start + start * 8))
+        return out
+
+    def lookup(self, city_filter: str = "", category_filter: Optional[str] = None) -> Optional[List[int]]:
+        """Return sorted byte offsets of candidate lines, or None when no filter narrows the scan."""
+        city_filter = (city_filter or "").lower().strip()
+        cat_filter = (category_filter or "").lower().strip()
+        result = None
+        if city_filter:
+            result = self._offsets_matching("city", city_filter)
+        if cat_filter:
+            cat_offsets = self._offsets_matching("category", cat_filter)
+            result = cat_offsets if result is None else (result & cat_offsets)
+        return None if result is None else sorted(result)
+
+def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * 6371.0088 * math.asin(min(1.0, math.sqrt(a)))
+
+class YelpGeoIndex(_MappedIndex):
+    """Latitude/longitude grid over the Yelp records, written by build_yelp_index()."""
+    MAGIC = YELP_GEO_INDEX_MAGIC
+
+    def within(self, lat: float, lon: float, radius_km: float) -> List[tuple]:
+        """Return [(distance_km, offset)] for every record within radius_km of (lat, lon), nearest first."""
+        cell = self.directory.get("cell_deg", YELP_GEO_CELL_DEG)
+        cells = self.directory.get("cells", {})
+        dlat = radius_km / 110.574
+        dlon = radius_km / max(1e-6, 111.320 * math.cos(math.radians(lat)))
+        out = []
+        for ci in range(int((lat - dlat) // cell), int((lat + dlat) // cell) + 1):
+            for cj in range(int((lon - dlon) // cell), int((lon + dlon) // cell) + 1):
+                entry = cells.get(f"{ci},{cj}")
+                if not entry:
+                    continue
+                start = self._data_start + entry[0] * _YELP_GEO_RECORD.size
+                block = self._mm[start:start + entry[1] * _YELP_GEO_RECORD.size]
+                for rlat, rlon, off in _YELP_GEO_RECORD.iter_unpack(block):
+                    d = _haversine_km(lat, lon, rlat, rlon)
+                    if d <= radius_km:
+                        out.append((d, off))
+        out.sort()
+        return out
+
+_YELP_INDEXES: Dict[tuple, _MappedIndex] = {}
+# guards _YELP_INDEXES (search and import workers open indexes concurrently); held while an index builds
+# so two threads never build or close the same files at once
+_yelp_indexes_lock = threading.RLock()
+
+def _get_mapped_index(path: str, cls, suffix: str, build: bool):
+    with _yelp_indexes_lock:
+        return _get_mapped_index_locked(path, cls, suffix, build)
+
+def _get_mapped_index_locked(path: str, cls, suffix: str, build: bool):
+    ident = _file_identity(path)
+    if ident is None:
+        return None
+    cached = _YELP_INDEXES.get((path, suffix))
+    if cached is not None:
+        if (cached.source_size, cached.source_mtime_ns) == ident:
+            return cached
+        cached.close()
+        _YELP_INDEXES.pop((path, suffix), None)
+    index_path = _cache_path_for(path, suffix)
+    idx = None
+    try:
+        if os.path.exists(index_path):
+            idx = cls(index_path)
+            if (idx.source_size, idx.source_mtime_ns) != ident:
+                idx.close()
+                idx = None
+    except Exception:
+        idx = None
+    if idx is None:
+        if not build:
+            return None
+        # close stale views of the other index before it is replaced
+        for key in [k for k in _YELP_INDEXES if k[0] == path]:
+            _YELP_INDEXES.pop(key).close()
+        if build_yelp_index(path) is None:
+            return None
+        try:
+            idx = cls(index_path)
+        except Exception as e:
+            log(f"Yelp index open failed for {index_path}: {e}")
+            return None
+    _YELP_INDEXES[(path, suffix)] = idx
+    return idx
+
+def get_yelp_index(path: str, build: bool = True) -> Optional[YelpIndex]:
+    """Return an up-to-date YelpIndex for path, rebuilding it when the source size or mtime changed."""
+    return _get_mapped_index(path, YelpIndex, ".lidx", build)
+
+def get_yelp_geo_index(path: str, build: bool = True) -> Optional[YelpGeoIndex]:
+    """Return an up-to-date YelpGeoIndex for path (built together with the city/category index)."""
+    return _get_mapped_index(path, YelpGeoIndex, ".lgeo", build)
+
+def _iter_yelp_lines(f, offsets):
+    """Yield raw lines from f: every line when offsets is None, otherwise only the lines starting at offsets."""
+    if offsets is None:
+        yield from f
+        return
+    for off in offsets:
+        f.seek(off)
+        yield f.readline()
+
+# Skip json decoding for lines whose raw bytes cannot contain the city/category filter text
+YELP_PREFILTER = True
+
+def _prefilter_needles(*filters) -> List[bytes]:
+    """Return the filters usable as raw-byte needles: lowercased ASCII text that JSON never escapes."""
+    out = []
+    for text in filters:
+        text = (text or "").lower().strip()
+        if text and text.isascii() and '"' not in text and "\\" not in text:
+            out.append(text.encode("ascii"))
+    return out
+
+def _iter_range_lines(mm, start: int, end: int, needles: List[bytes]):
+    """Yield the raw lines of mm[start:end] that may contain every needle (ASCII case-insensitive).
+    The first needle is searched with one regex over the mapped bytes, so rejected lines are never copied.
+    Lines with non-ASCII bytes are always yielded, because str.lower() can map some of those characters to ASCII.
+    """
+    pos = start
+    if not needles:
+        while pos < end:
+            le = mm.find(b"\n", pos, end)
+            le = end if le < 0 else le + 1
+            yield mm[pos:le]
+            pos = le
+        return
+    pattern = re.compile(re.escape(needles[0]) + rb"|[\x80-\xff]", re.IGNORECASE)
+    rest = needles[1:]
+    while pos < end:
+        m = pattern.search(mm, pos, end)
+        if m is None:
+            return
+        ls = mm.rfind(b"\n", pos, m.start())
+        ls = pos if ls < 0 else ls + 1
+        le = mm.find(b"\n", m.end(), end)
+        le = end if le < 0 else le + 1
+        pos = le
+        line = mm[ls:le]
+        if rest and line.isascii():
+            low = line.lower()
+            if not all(n in low for n in rest):
+                continue
+        yield line
+
+YELP_AVERAGE_REVIEW_TEXT = "Imported from Yelp (Yelp average rating)"
+
+def _yelp_record_to_item(obj, city_filter, category_filter=None, debug=False):
+    """Apply the chain/city/category filters to one decoded Yelp record.
+    Returns the simplified business dict, or None when the record is filtered out.
+    debug=True writes the record's summary line to the Yelp debug log.
+    """
+    name = (obj.get("name") or "").lower().strip()
+    if is_big_chain(name):
+        return None
+    city_val = (obj.get("city") or "").lower().strip()
+    if debug:
+        log(f"Loaded: {obj.get('name','')} | City: {city_val} | Categories: {obj.get('categories','')}", logging.DEBUG, "yelp")
+    if city_filter and city_filter not in city_val:
+        return None
+    # Improved category filtering
+    if category_filter:
+        cats = obj.get("categories") or ""
+        cat_list = [c.strip().lower() for c in cats.split(",") if c.strip()]
+        filter_val = category_filter.lower().strip()
+        if not any(filter_val in c for c in cat_list):
+            return None
+    # Add Yelp review as a Review dict
+    stars = obj.get("stars", None)
+    yelp_review = []
+    if stars is not None:
+        try:
+            stars_int = int(round(float(stars)))
+        except Exception:
+            stars_int = 0
+        yelp_review = [{
+            "rating": stars_int,
+            "text": YELP_AVERAGE_REVIEW_TEXT,
+            "timestamp": time.time()
+        }]
+    return {
+        "external_id": obj.get("business_id"),
+        "name": obj.get("name", ""),
+        "category": obj.get("categories", ""),
+        "address": f"{obj.get('address','')}, {obj.get('city','')}",
+        "deal": "",
+        "reviews": yelp_review
+    }
+
+# Parallel import: files at least this large are split across a process pool when workers > 1
+YELP_IMPORT_WORKERS = os.cpu_count() or 1
+YELP_PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+# chunks per worker; more chunks let a satisfied limit cancel more of the remaining work
+YELP_CHUNKS_PER_WORKER = 4
+
+def _yelp_chunk_ranges(path: str, chunks: int) -> List[tuple]:
+    """Split path into up to `chunks` (start, end) byte ranges that begin and end on line boundaries."""
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, "rb") as f:
+        for i in range(1, chunks):
+            target = size * i // chunks
+            if target <= bounds[-1]:
+                continue
+            # land on the first line that starts at or after target
+            f.seek(target - 1)
+            f.readline()
+            pos = f.tell()
+            if bounds[-1] < pos < size:
+                bounds.append(pos)
+    bounds.append(size)
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1) if bounds[i] < bounds[i + 1]]
+
+def _parse_yelp_chunk(path, start, end, city_filter, category_filter, limit):
+    """Process-pool worker: decode and filter the lines in [start, end), returning at most `limit` items in file order."""
+    out = []
+    needles = _prefilter_needles(city_filter, category_filter) if YELP_PREFILTER else []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for line in _iter_range_lines(mm, start, end, needles):
+            try:
+                obj = _json_loads(line)
+            except Exception:
+                continue
+            item = _yelp_record_to_item(obj, city_filter, category_filter)
+            if item is not None:
+                out.append(item)
+                if len(out) >= limit:
+                    break
+    return out
+
+def _iter_yelp_parallel(path, city_filter, limit, category_filter, workers, cancel=None):
+    """Parse line-aligned chunks of path in a process pool and yield their items in file order.
+    Once `limit` rows have been yielded (or cancel is set), chunks that have not started are cancelled
+    and the generator returns without waiting for the chunks still running.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    ranges = _yelp_chunk_ranges(path, workers * YELP_CHUNKS_PER_WORKER)
+    produced = 0
+    # not a `with` block: its exit is shutdown(wait=True), which would run every submitted chunk to the end
+    pool = ProcessPoolExecutor(max_workers=workers)
+    futures = []
+    try:
+        futures = [pool.submit(_parse_yelp_chunk, path, a, b, city_filter, category_filter, limit) for a, b in ranges]
+        for fut in futures:
+            if cancel is not None and cancel.is_set():
+                break
+            for item in fut.result():
+                yield item
+                produced += 1
+                if produced >= limit:
+                    return
+    finally:
+        # cancel chunks that have not started by hand (shutdown(cancel_futures=True) needs Python 3.9)
+        for pending in futures:
+            pending.cancel()
+        pool.shutdown(wait=False)
+        log(f"Parallel Yelp import: {len(ranges)} chunks, {workers} workers, {produced} rows")
+
+def iter_yelp_academic_businesses(path, city_filter="", limit=500, category_filter=None, use_index=True, workers=1, cancel=None):
+    """Yield up to `limit` simplified business dicts from the Yelp JSON-lines file, in file order.
+    workers > 1 (or None for YELP_IMPORT_WORKERS) parses large unindexed scans in a process pool.
+    cancel is an optional threading.Event; iteration stops shortly after it is set.
+    """
+    city_filter = city_filter.lower().strip()
+    if limit <= 0:
+        return
+    # With an index, only the lines recorded for the matching city/category keys are read and decoded
+    offsets = None
+    if use_index and (city_filter or (category_filter or "").strip()):
+        idx = get_yelp_index(path)
+        if idx is not None:
+            offsets = idx.lookup(city_filter, category_filter)
+    if workers is None:
+        workers = YELP_IMPORT_WORKERS
+    if offsets is None and workers > 1:
+        try:
+            parallel = os.path.getsize(path) >= YELP_PARALLEL_MIN_BYTES
+        except Exception:
+            parallel = False
+        if parallel:
+            yield from _iter_yelp_parallel(path, city_filter, limit, category_filter, workers, cancel)
+            return
+    produced = 0
+    scanned = 0
+    sample_every = YELP_DEBUG_SAMPLE_EVERY if get_logger("yelp").isEnabledFor(logging.DEBUG) else 0
+    with open(path, "rb") as f:
+        mm = None
+        if offsets is None and os.fstat(f.fileno()).st_size > 0:
+            # full scan: walk a memory map and only decode lines that pass the byte prefilter
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            needles = _prefilter_needles(city_filter, category_filter) if YELP_PREFILTER else []
+            lines = _iter_range_lines(mm, 0, len(mm), needles)
+        else:
+            lines = _iter_yelp_lines(f, offsets)
+        try:
+            for line in lines:
+                if cancel is not None and cancel.is_set():
+                    return
+                try:
+                    obj = _json_loads(line)
+                except:
+                    continue
+                scanned += 1
+                debug = bool(sample_every) and (scanned - 1) % sample_every == 0
+                item = _yelp_record_to_item(obj, city_filter, category_filter, debug)
+                if item is None:
+                    continue
+                yield item
+                produced += 1
+                if produced >= limit:
+                    break
+        finally:
+            if mm is not None:
+                mm.close()
+    log(f"Yelp import scanned {scanned} records, kept {produced}", logging.DEBUG, "yelp")
+
+def import_yelp_academic_businesses(path, city_filter="", limit=500, category_filter=None, use_index=True, workers=1):
+    """Return the items of iter_yelp_academic_businesses() as a list."""
+    return list(iter_yelp_academic_businesses(path, city_filter, limit, category_filter, use_index, workers))
+
+# default search radius for location searches (matches the Overpass radius search)
+YELP_SEARCH_RADIUS_KM = 8.0
+
+def iter_yelp_within_radius(path, lat, lon, radius_km=YELP_SEARCH_RADIUS_KM, limit=500, category_filter=None, cancel=None):
+    """Yield up to `limit` simplified business dicts within radius_km of (lat, lon), nearest first.
+    Uses the spatial grid from get_yelp_geo_index(); yields nothing if the index cannot be built.
+    """
+    idx = get_yelp_geo_index(path)
+    if idx is None or limit <= 0:
+        return
+    produced = 0
+    with open(path, "rb") as f:
+        for _, off in idx.within(lat, lon, radius_km):
+            if cancel is not None and cancel.is_set():
+                return
+            f.seek(off)
+            try:
+                obj = _json_loads(f.readline())
+            except Exception:
+                continue
+            item = _yelp_record_to_item(obj, "", category_filter)
+            if item is None:
+                continue
+            yield item
+            produced += 1
+            if produced >= limit:
+                return
+
+def import_yelp_within_radius(path, lat, lon, radius_km=YELP_SEARCH_RADIUS_KM, limit=500, category_filter=None):
+    """Return the items of iter_yelp_within_radius() as a list."""
+    return list(iter_yelp_within_radius(path, lat, lon, radius_km, limit, category_filter))
+
+def iter_yelp_search_batches(path, location, category, limit, cancel=None, batch_size=25, max_delay=0.1, center=None):
+    """Group Yelp search results into small lists so a UI can show rows while the scan is still running.
+    With center=(lat, lon) the search covers YELP_SEARCH_RADIUS_KM around that point instead of matching the city name.
+    A batch is yielded after batch_size rows or max_delay seconds, whichever comes first.
+    """
+    if center is not None:
+        items = iter_yelp_within_radius(path, center[0], center[1], YELP_SEARCH_RADIUS_KM, limit, category or None, cancel)
+    else:
+        items = iter_yelp_academic_businesses(path, location, limit, category_filter=category or None, workers=None, cancel=cancel)
+    batch = []
+    last = time.monotonic()
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size or time.monotonic() - last >= max_delay:
+            yield batch
+            batch = []
+            last = time.monotonic()
+    if batch:
+        yield batch
+
+# Streaming join of the (multi-GB) Yelp review file onto imported businesses
+_REVIEW_BUSINESS_ID_RE = re.compile(rb'"business_id"\s*:\s*"([^"]*)"')
+
+def _parse_yelp_date(value: str) -> float:
+    try:
+        return time.mktime(time.strptime(value[:19], "%Y-%m-%d %H:%M:%S"))
+    except Exception:
+        return 0.0
+
+def import_yelp_reviews(path, business_ids, top_n=YELP_REVIEWS_PER_BUSINESS, cancel=None) -> Dict[str, Dict]:
+    """Stream the Yelp review file and aggregate ratings for the given business ids.
+    Returns {business_id: {"count": n, "hist": [c1..c5], "recent": [review dicts, newest first]}}.
+    Only lines whose raw business_id is wanted are decoded, and at most top_n review texts are kept
+    per business, so memory is bounded by the number of businesses rather than the file size.
+    """
+    wanted = {str(bid).encode("utf-8") for bid in business_ids if bid}
+    aggs: Dict[str, Dict] = {}
+    if not wanted:
+        return aggs
+    with open(path, "rb", buffering=1 << 20) as f:
+        for n, line in enumerate(f):
+            if cancel is not None and n % 4096 == 0 and cancel.is_set():
                 break
-    return res
+            m = _REVIEW_BUSINESS_ID_RE.search(line)
+            if m is None or m.group(1) not in wanted:
+                continue
+            try:
+                obj = _json_loads(line)
+                stars = int(round(float(obj.get("stars") or 0)))
+            except Exception:
+                continue
+            if not 1 <= stars <= 5:
+                continue
+            agg = aggs.get(obj.get("business_id"))
+            if agg is None:
+                agg = aggs[obj.get("business_id")] = {"count": 0, "hist": [0] * 5, "recent": []}
+            agg["count"] += 1
+            agg["hist"][stars - 1] += 1
+            if top_n > 0:
+                # min-heap on the ISO date string keeps the newest top_n reviews
+                entry = (obj.get("date") or "", obj.get("review_id") or "", stars, obj.get("text") or "")
+                if len(agg["recent"]) < top_n:
+                    heapq.heappush(agg["recent"], entry)
+                elif entry > agg["recent"][0]:
+                    heapq.heapreplace(agg["recent"], entry)
+    for agg in aggs.values():
+        agg["recent"] = [{"rating": stars, "text": text, "timestamp": _parse_yelp_date(date), "source": "yelp"}
+                         for date, _, stars, text in sorted(agg["recent"], reverse=True)]
+    log(f"Yelp review import: {len(aggs)} of {len(wanted)} businesses matched")
+    return aggs
+
+def get_yelp_review_aggregates(path, business_ids, top_n=YELP_REVIEWS_PER_BUSINESS, cancel=None) -> Dict[str, Dict]:
+    """import_yelp_reviews with per-business results kept in SearchResultCache (keyed by the review file's
+    size/mtime): the review file is only streamed for ids not seen before, and not at all when every id is
+    cached. Ids without reviews are remembered too, but left out of the result like import_yelp_reviews does.
+    """
+    ids = list(dict.fromkeys(str(bid) for bid in business_ids if bid))
+    cache = get_search_cache()
+    if cache is None:
+        return import_yelp_reviews(path, ids, top_n, cancel)
+    ident = _file_identity(path)
+    keys = {bid: SearchResultCache.make_key("yelp_reviews", bid, "", top_n, ident) for bid in ids}
+    aggs: Dict[str, Dict] = {}
+    missing = []
+    for bid in ids:
+        cached = cache.get("yelp_reviews", keys[bid])
+        if cached is None:
+            missing.append(bid)
+        elif cached.get("count"):
+            aggs[bid] = cached
+    if missing:
+        scanned = import_yelp_reviews(path, missing, top_n, cancel)
+        aggs.update(scanned)
+        if cancel is None or not cancel.is_set():
+            empty = {"count": 0, "hist": [0] * 5, "recent": []}
+            for bid in missing:
+                cache.put("yelp_reviews", keys[bid], scanned.get(bid, empty))
+    log(f"Yelp review aggregates: {len(ids) - len(missing)} cached, {len(missing)} scanned")
+    return aggs
+
+def apply_yelp_review_aggregates(raw, aggregates) -> int:
+    """Attach aggregated Yelp reviews to raw businesses with a matching external_id.
+    The synthetic average-rating review and any earlier Yelp reviews are replaced; ratings without a
+    stored text go to 'extra_ratings' so avg_rating()/review_count() cover the whole corpus.
+    Returns the number of businesses updated.
+    """
+    updated = 0
+    businesses = raw.get("businesses", [])
+    for i, b in enumerate(businesses):
+        if not isinstance(b, dict):
+            continue
+        agg = aggregates.get(b.get("external_id"))
+        if not agg:
+            continue
+        own = [r for r in b.get("reviews", []) if isinstance(r, dict)
+               and r.get("source") != "yelp" and r.get("text") != YELP_AVERAGE_REVIEW_TEXT]
+        extra = list(agg["hist"])
+        for r in agg["recent"]:
+            extra[r["rating"] - 1] -= 1
+        businesses[i] = dict(b, reviews=own + [dict(r) for r in agg["recent"]], extra_ratings=extra)
+        updated += 1
+    return updated
+
+# Incremental refresh: a manifest of per-record line hashes lets a re-import decode only new/changed records
+YELP_MANIFEST_VERSION = 1
+
+def _line_hash(line: bytes) -> str:
+    return hashlib.blake2b(line, digest_size=8).hexdigest()
+
+def load_yelp_manifest(path: str) -> Dict:
+    """Return the refresh manifest for path ({"segments": [[start, end, hash]], "records": {business_id: hash}})."""
+    try:
+        with open(_cache_path_for(path, ".manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == YELP_MANIFEST_VERSION:
+            return manifest
+    except Exception:
+        pass
+    return {"version": YELP_MANIFEST_VERSION, "segments": [], "records": {}}
+
+def save_yelp_manifest(path: str, manifest: Dict) -> None:
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        manifest_path = _cache_path_for(path, ".manifest.json")
+        with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, separators=(",", ":"))
+        os.replace(manifest_path + ".tmp", manifest_path)
+    except Exception as e:
+        log(f"Could not write Yelp manifest: {e}")
+
+def _segments_unchanged(f, segments) -> bool:
+    """True if every recorded [start, end, hash] byte range of the open file still hashes the same."""
+    for start, end, digest in segments:
+        h = hashlib.blake2b(digest_size=16)
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = f.read(min(remaining, 1 << 20))
+            if not chunk:
+                return False
+            h.update(chunk)
+            remaining -= len(chunk)
+        if h.hexdigest() != digest:
+            return False
+    return True
+
+def scan_yelp_changes(path, known_ids=(), city_filter="", category_filter=None, manifest=None):
+    """Find Yelp records that are new or changed since the manifest was written.
+    If the previously processed prefix of the file is byte-identical, only the appended tail is read;
+    otherwise every line is hashed and only lines whose hash differs are decoded.
+    Changed records whose business_id is in known_ids are always returned (as updates);
+    other records are returned only if a city_filter is given and they pass the city/category filters
+    (an empty filter would insert every changed record in the dataset). Without a manifest the
+    scan is a baseline: known businesses are updated, but records that already existed are not inserted.
+    Returns (items, new_manifest, stats).
+    """
+    manifest = manifest if manifest is not None else load_yelp_manifest(path)
+    records = dict(manifest.get("records", {}))
+    segments = [list(seg) for seg in manifest.get("segments", [])]
+    known = set(known_ids)
+    city_filter = (city_filter or "").lower().strip()
+    items = []
+    baseline = not records
+    stats = {"mode": "baseline" if baseline else "full", "scanned": 0, "decoded": 0}
+    with open(path, "rb") as f:
+        start = 0
+        if segments and _segments_unchanged(f, segments):
+            start = segments[-1][1]
+            stats["mode"] = "append"
+        else:
+            segments = []
+        f.seek(start)
+        pos = start
+        h = hashlib.blake2b(digest_size=16)
+        for line in f:
+            if not line.endswith(b"\n"):
+                # partially written last line; pick it up on the next refresh
+                break
+            pos += len(line)
+            h.update(line)
+            stats["scanned"] += 1
+            m = _REVIEW_BUSINESS_ID_RE.search(line)
+            if m is None:
+                continue
+            bid = m.group(1).decode("utf-8", "replace")
+            digest = _line_hash(line)
+            if records.get(bid) == digest:
+                continue
+            records[bid] = digest
+            try:
+                obj = _json_loads(line)
+            except Exception:
+                continue
+            stats["decoded"] += 1
+            if bid in known:
+                item = _yelp_record_to_item(obj, "", None)
+            elif not baseline and city_filter:
+                item = _yelp_record_to_item(obj, city_filter, category_filter)
+            else:
+                item = None
+            if item is not None:
+                items.append(item)
+        if pos > start:
+            segments.append([start, pos, h.hexdigest()])
+    stats["changed"] = len(items)
+    return items, {"version": YELP_MANIFEST_VERSION, "segments": segments, "records": records}, stats
+
+def apply_yelp_changes(raw, items) -> tuple:
+    """Upsert Yelp items into raw['businesses'] by external_id. Returns (inserted, updated).
+    Updates keep user reviews, attached Yelp reviews and extra_ratings; only the listing fields and
+    the synthetic average-rating review are replaced.
+    """
+    businesses = raw.setdefault("businesses", [])
+    by_ext = {b.get("external_id"): i for i, b in enumerate(businesses) if isinstance(b, dict) and b.get("external_id")}
+    ids = [b.get("id") for b in businesses if isinstance(b, dict)]
+    next_id = max([int(i) for i in ids if isinstance(i, int) or (isinstance(i, str) and i.isdigit())] + [0]) + 1
+    inserted = updated = 0
+    for item in items:
+        pos = by_ext.get(item.get("external_id"))
+        if pos is None:
+            entry = dict(item)
+            entry["id"] = next_id
+            next_id += 1
+            businesses.append(entry)
+            by_ext[entry.get("external_id")] = len(businesses) - 1
+            inserted += 1
+            continue
+        existing = dict(businesses[pos])
+        for key in ("name", "category", "address"):
+            existing[key] = item.get(key, existing.get(key, ""))
+        kept = [r for r in existing.get("reviews", []) if not (isinstance(r, dict) and r.get("text") == YELP_AVERAGE_REVIEW_TEXT)]
+        has_real = any(isinstance(r, dict) and r.get("source") == "yelp" for r in kept) or existing.get("extra_ratings")
+        existing["reviews"] = kept if has_real else kept + item.get("reviews", [])
+        businesses[pos] = existing
+        updated += 1
+    return inserted, updated
+
+def refresh_yelp_import(raw, path, city_filter="", category_filter=None) -> Dict:
+    """Apply new/changed Yelp records to raw and record them in the manifest. Returns scan statistics."""
+    known = [b.get("external_id") for b in raw.get("businesses", []) if isinstance(b, dict) and b.get("external_id")]
+    items, manifest, stats = scan_yelp_changes(path, known, city_filter, category_filter)
+    stats["inserted"], stats["updated"] = apply_yelp_changes(raw, items)
+    save_yelp_manifest(path, manifest)
+    return stats
+
 YELP_SEARCH_URL = "https://api.yelp.com/v3/businesses/search"
 CONFIG_PATH = os.path.expanduser("~/.business_app_config.json")
 def get_saved_api_key():
@@ -228,14 +2297,199 @@ def integrate_yelp_results(raw, yelp_items):
     for item in yelp_items:
         entry = {"id": next_id, "name": item.get("name",""), "category": item.get("category",""), "address": item.get("address",""), "deal": item.get("deal",""), "reviews": item.get("reviews",[])}
         if item.get("external_id"): entry["external_id"] = item["external_id"]
+        if item.get("extra_ratings"): entry["extra_ratings"] = item["extra_ratings"]
         raw["businesses"].append(entry)
         next_id += 1
     return len(yelp_items)
 
-def fetch_from_overpass(location: str, tags: str = "restaurant|cafe|bar", limit: int = 50) -> List[Dict]:
+# Persistent cache of geocodes and per-source search results (see SearchResultCache)
+SEARCH_CACHE_FILE = os.path.join(CACHE_DIR, "search_cache.sqlite3")
+SEARCH_CACHE_MAX_BYTES = 16 * 1024 * 1024
+# seconds an entry stays fresh, per source; Yelp keys also carry the dataset's size/mtime
+SEARCH_CACHE_TTLS = {"geocode": 30 * 86400, "osm": 86400, "yelp": 7 * 86400, "yelp_reviews": 30 * 86400}
+# bump when the Overpass query or conversion changes so old results are not reused
+OSM_RESULTS_VERSION = 1
+
+class SearchResultCache:
+    """Disk-backed, size-bounded LRU of JSON-serializable results keyed by (source, location, category,
+    limit, source version). Entries expire after SEARCH_CACHE_TTLS[source]; once the payloads exceed
+    max_bytes the least recently used entries are evicted. Hit/miss counts are kept per source.
+    """
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entries (
+        key TEXT PRIMARY KEY,
+        source TEXT NOT NULL,
+        created REAL NOT NULL,
+        accessed REAL NOT NULL,
+        size INTEGER NOT NULL,
+        payload BLOB NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed);
+    """
+
+    def __init__(self, path: str, max_bytes: int = SEARCH_CACHE_MAX_BYTES, ttls: Optional[Dict[str, float]] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(SEARCH_CACHE_TTLS if ttls is None else ttls)
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    @staticmethod
+    def make_key(source: str, location: str, category: str = "", limit: int = 0, version=None) -> str:
+        parts = [source, " ".join((location or "").lower().split()), (category or "").strip().lower(), limit, version]
+        return hashlib.sha1(json.dumps(parts, default=str).encode("utf-8")).hexdigest()
+
+    def get(self, source: str, key: str):
+        """Return the cached value for key, or None if missing or older than the source's TTL."""
+        now = time.time()
+        with self._lock:
+            try:
+                row = self.conn.execute("SELECT created, payload FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is not None and now - row[0] > self.ttls.get(source, 0):
+                    with self.conn:
+                        self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    row = None
+                if row is not None:
+                    with self.conn:
+                        self.conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+                    value = json.loads(zlib.decompress(row[1]).decode("utf-8"))
+                else:
+                    value = None
+            except Exception as e:
+                log(f"Search cache read failed: {e}", logging.WARNING)
+                value = None
+            counts = self.misses if value is None else self.hits
+            counts[source] = counts.get(source, 0) + 1
+        log(f"Search cache {'miss' if value is None else 'hit'}: {source}", logging.DEBUG)
+        return value
+
+    def put(self, source: str, key: str, value) -> None:
+        """Store value under key, then evict least recently used entries beyond max_bytes."""
+        try:
+            payload = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        except Exception as e:
+            log(f"Search cache could not encode {source} result: {e}", logging.WARNING)
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                with self.conn:
+                    self.conn.execute("INSERT OR REPLACE INTO entries (key, source, created, accessed, size, payload) "
+                                      "VALUES (?, ?, ?, ?, ?, ?)", (key, source, now, now, len(payload), payload))
+                    self._evict()
+            except Exception as e:
+                log(f"Search cache write failed: {e}", logging.WARNING)
+
+    def _evict(self) -> None:
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self.conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self.conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def stats(self) -> Dict[str, tuple]:
+        """{source: (hits, misses)} since this cache was opened."""
+        with self._lock:
+            return {src: (self.hits.get(src, 0), self.misses.get(src, 0)) for src in set(self.hits) | set(self.misses)}
+
+_search_cache: Optional[SearchResultCache] = None
+_search_cache_lock = threading.Lock()
+
+def get_search_cache() -> Optional[SearchResultCache]:
+    """Shared SearchResultCache, or None if the cache file cannot be opened."""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            try:
+                _search_cache = SearchResultCache(SEARCH_CACHE_FILE)
+            except Exception as e:
+                log(f"Search cache unavailable: {e}", logging.WARNING)
+                return None
+        return _search_cache
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+NOMINATIM_HEADERS = {
+    "User-Agent": "LocalLift/1.0 (student desktop app)",
+    "Accept": "application/json"
+}
+_geocode_cache: Dict[str, tuple] = {}
+_geocode_lock = threading.Lock()
+# one lock per location key: concurrent lookups of the same place wait for the first instead of
+# sending their own Nominatim request (its usage policy allows one request per second)
+_geocode_key_locks: Dict[str, threading.Lock] = {}
+
+def geocode_location(location: str) -> Optional[tuple]:
+    """Return (lat, lon) for a free-text location using Nominatim, or None on failure.
+    Successful lookups are cached for the session so the Yelp and OSM searches share one request
+    (a lookup already in flight for the same location is waited for, not repeated), and on disk
+    (SearchResultCache, "geocode" TTL) so later sessions skip Nominatim.
+    """
+    key = (location or "").strip().lower()
+    if not key or not REQUESTS_AVAILABLE:
+        return None
+    with _geocode_lock:
+        if key in _geocode_cache:
+            return _geocode_cache[key]
+        key_lock = _geocode_key_locks.setdefault(key, threading.Lock())
+    with key_lock:
+        with _geocode_lock:
+            if key in _geocode_cache:
+                return _geocode_cache[key]
+        return _geocode_uncached(location, key)
+
+def _geocode_uncached(location: str, key: str) -> Optional[tuple]:
+    """Disk cache, then Nominatim, for geocode_location (called with the key's lock held)."""
+    cache = get_search_cache()
+    cache_key = SearchResultCache.make_key("geocode", key)
+    cached = cache.get("geocode", cache_key) if cache is not None else None
+    if cached is not None:
+        point = (float(cached[0]), float(cached[1]))
+        with _geocode_lock:
+            _geocode_cache[key] = point
+        return point
+    try:
+        log(f"Nominatim query: {location}", channel="osm")
+        resp = requests.get(
+            NOMINATIM_URL,
+            params={"q": location, "format": "json", "limit": 1},
+            headers=NOMINATIM_HEADERS,
+            timeout=15
+        )
+        resp.raise_for_status()
+        results = resp.json()
+        if not results:
+            return None
+        point = (float(results[0]["lat"]), float(results[0]["lon"]))
+    except Exception as e:
+        log(f"Nominatim/geocode error: {e}", channel="osm")
+        return None
+    with _geocode_lock:
+        _geocode_cache[key] = point
+    if cache is not None:
+        cache.put("geocode", cache_key, list(point))
+    return point
+
+def fetch_from_overpass(location: str, tags: str = "restaurant|cafe|bar", limit: int = 50, progress=None) -> List[Dict]:
     """Fetch POIs from OpenStreetMap using Nominatim + Overpass.
     Uses a center-point radius search instead of a giant city bbox so that
     large places like Chicago/Manhattan do not time out.
+    progress, if given, is called with a short status string before each network step
+    ("cached" when a non-empty result younger than the "osm" TTL is reused from SearchResultCache).
     """
     tags = (tags or "").strip().lower()
 
@@ -250,14 +2504,28 @@ def fetch_from_overpass(location: str, tags: str = "restaurant|cafe|bar", limit:
     elif not tags:
         tags = "restaurant|cafe|bar|fast_food|pub|coffee|bakery|ice_cream|deli"
 
-    LOG_PATH = os.path.expanduser("~/.business_app_osm_import.log")
-
     def _log(msg: str) -> None:
-        try:
-            with open(LOG_PATH, "a", encoding="utf-8") as lf:
-                lf.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {msg}\n")
-        except Exception:
-            pass
+        log(msg, channel="osm")
+
+    def _progress(msg: str) -> None:
+        if progress is not None:
+            try:
+                progress(msg)
+            except Exception:
+                pass
+
+    cache = get_search_cache()
+    cache_key = SearchResultCache.make_key("osm", location, tags, limit, OSM_RESULTS_VERSION)
+    cached = cache.get("osm", cache_key) if cache is not None else None
+    if cached is not None:
+        _progress("cached")
+        return cached
+
+    def _cached(items: List[Dict]) -> List[Dict]:
+        # only non-empty results are kept: an empty list may just be an Overpass timeout
+        if items and cache is not None:
+            cache.put("osm", cache_key, items)
+        return items
 
     def run_overpass_query(q: str) -> List[Dict]:
         url = "https://overpass-api.de/api/interpreter"
@@ -322,25 +2590,11 @@ def fetch_from_overpass(location: str, tags: str = "restaurant|cafe|bar", limit:
 
     # Step 1: geocode location to a center point
     try:
-        nom_url = "https://nominatim.openstreetmap.org/search"
-        headers = {
-            "User-Agent": "LocalLift/1.0 (student desktop app)",
-            "Accept": "application/json"
-        }
+        _progress("geocoding")
+        center = geocode_location(location)
 
-        _log(f"Nominatim query: {location}")
-        resp = requests.get(
-            nom_url,
-            params={"q": location, "format": "json", "limit": 1},
-            headers=headers,
-            timeout=15
-        )
-        resp.raise_for_status()
-        results = resp.json()
-
-        if results:
-            lat = float(results[0]["lat"])
-            lon = float(results[0]["lon"])
+        if center:
+            lat, lon = center
 
             # radius in meters; use a manageable search size for big cities
             radius = 8000
@@ -363,9 +2617,10 @@ def fetch_from_overpass(location: str, tags: str = "restaurant|cafe|bar", limit:
 );
 out center;'''
 
+            _progress("querying Overpass")
             elems = run_overpass_query(q_center)
             if elems:
-                return _convert_elements(elems, limit)
+                return _cached(_convert_elements(elems, limit))
 
     except Exception as e:
         _log(f"Nominatim/geocode error: {e}")
@@ -390,9 +2645,10 @@ area["name"~"^{safe_loc}$", i]->.searchArea;
 );
 out center;'''
 
+        _progress("area fallback")
         elems = run_overpass_query(q_name)
         if elems:
-            return _convert_elements(elems, limit)
+            return _cached(_convert_elements(elems, limit))
 
     except Exception as e:
         _log(f"Area fallback error: {e}")
@@ -400,11 +2656,7 @@ out center;'''
     _log("No POIs found for provided location/tags")
     return []
     def _log(msg: str) -> None:
-        try:
-            with open(LOG_PATH, "a", encoding="utf-8") as lf:
-                lf.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {msg}\n")
-        except Exception:
-            pass
+        log(msg, channel="osm")
 
     def run_overpass_query(q: str) -> List[Dict]:
         url = "https://overpass-api.de/api/interpreter"
@@ -447,38 +2699,65 @@ def get_saved_default_location() -> Optional[str]:
         pass
     return None
 
-def extract_yelp_categories(path):
+def scan_yelp_categories(path):
+    """Read the Yelp file once and return (sorted individual categories, sorted raw category strings)."""
     categories = set()
+    category_strings = set()
     try:
-        with open(path, "r", encoding="utf-8") as f:
+        with open(path, "rb") as f:
             for line in f:
                 try:
-                    obj = json.loads(line)
-                    cats = obj.get("categories", "")
-                    if cats:
-                        for cat in cats.split(","):
-                            categories.add(cat.strip())
+                    cats = _json_loads(line).get("categories") or ""
                 except Exception:
                     continue
+                if not cats:
+                    continue
+                category_strings.add(cats.strip())
+                for cat in cats.split(","):
+                    categories.add(cat.strip())
     except Exception:
         pass
-    return sorted(categories)
+    return sorted(categories), sorted(category_strings)
 
-def extract_yelp_category_strings(path):
-    category_strings = set()
+def load_cached_yelp_categories(path):
+    """Return (categories, category_strings) from the on-disk cache if it matches the file's size/mtime, else None."""
+    ident = _file_identity(path)
+    if ident is None:
+        return None
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    obj = json.loads(line)
-                    cats = obj.get("categories", "")
-                    if cats:
-                        category_strings.add(cats.strip())
-                except Exception:
-                    continue
+        with open(_cache_path_for(path, ".categories.json"), "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if [cached.get("size"), cached.get("mtime_ns")] != list(ident):
+            return None
+        return list(cached.get("categories", [])), list(cached.get("category_strings", []))
     except Exception:
-        pass
-    return sorted(category_strings)
+        return None
+
+def get_yelp_category_lists(path):
+    """Return (categories, category_strings), scanning the Yelp file only when the cache is missing or stale."""
+    cached = load_cached_yelp_categories(path)
+    if cached is not None:
+        return cached
+    ident = _file_identity(path)
+    if ident is None:
+        return [], []
+    categories, category_strings = scan_yelp_categories(path)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        cache_path = _cache_path_for(path, ".categories.json")
+        with open(cache_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"size": ident[0], "mtime_ns": ident[1], "categories": categories,
+                       "category_strings": category_strings}, f, ensure_ascii=False)
+        os.replace(cache_path + ".tmp", cache_path)
+    except Exception as e:
+        log(f"Could not write Yelp category cache: {e}")
+    return categories, category_strings
+
+def extract_yelp_categories(path):
+    return get_yelp_category_lists(path)[0]
+
+def extract_yelp_category_strings(path):
+    return get_yelp_category_lists(path)[1]
 
 # ----------------- PYSIDE6 / QT UI (preferred) ---------------------------
 
@@ -490,6 +2769,56 @@ except Exception:
     PYSIDE_AVAILABLE = False
 
 if PYSIDE_AVAILABLE:
+    class _TaskSignals(QtCore.QObject):
+        """Signals used by _BackgroundTask to hand results back to the GUI thread."""
+        result = QtCore.Signal(object)
+        error = QtCore.Signal(str)
+
+    class _BackgroundTask(QtCore.QRunnable):
+        """Run fn(*args) on the global QThreadPool and emit its return value via signals.result."""
+        def __init__(self, fn, *args):
+            super().__init__()
+            self.fn = fn
+            self.args = args
+            self.signals = _TaskSignals()
+
+        def run(self):
+            try:
+                out = self.fn(*self.args)
+            except Exception as e:
+                self.signals.error.emit(str(e))
+                return
+            self.signals.result.emit(out)
+
+    class _SearchSignals(QtCore.QObject):
+        """Signals emitted by _SearchSourceTask; every signal carries the search id so stale results can be ignored."""
+        rows = QtCore.Signal(int, str, list)
+        progress = QtCore.Signal(int, str, str)
+        error = QtCore.Signal(int, str, str)
+        finished = QtCore.Signal(int, str)
+
+    class _SearchSourceTask(QtCore.QRunnable):
+        """Run one search source on the thread pool.
+        fn(emit_rows, emit_progress, cancel) calls emit_rows(list_of_items) as often as it has new rows.
+        """
+        def __init__(self, search_id: int, source: str, fn, cancel: threading.Event):
+            super().__init__()
+            self.search_id = search_id
+            self.source = source
+            self.fn = fn
+            self.cancel = cancel
+            self.signals = _SearchSignals()
+
+        def run(self):
+            sid, src = self.search_id, self.source
+            try:
+                self.fn(lambda items: self.signals.rows.emit(sid, src, list(items)),
+                        lambda msg: self.signals.progress.emit(sid, src, str(msg)),
+                        self.cancel)
+            except Exception as e:
+                self.signals.error.emit(sid, src, str(e))
+            self.signals.finished.emit(sid, src)
+
     class QtMainWindow(QtWidgets.QMainWindow):
         def __init__(self):
             super().__init__()
@@ -696,6 +3025,12 @@ if PYSIDE_AVAILABLE:
             for i in range(1, 6):
                 self.filter_rating.addItem(str(i))
             self.filter_rating.setStyleSheet("background:#23272e;color:#ffffff;border:1px solid #353b48;border-radius:8px;padding:4px 6px;")
+            # Live filter over the loaded list (name, category, address), updated while typing
+            self.live_filter = QtWidgets.QLineEdit()
+            self.live_filter.setPlaceholderText("Filter list (name, category, address)")
+            self.live_filter.setClearButtonEnabled(True)
+            self.live_filter.setMinimumWidth(200)
+            self.live_filter.setStyleSheet("background:#23272e;color:#ffffff;border:1px solid #353b48;border-radius:8px;padding:4px 6px;")
             # Search/Go button (runs combined import similar to Combined Search)
             self.go_btn = QtWidgets.QPushButton("Search")
             self.go_btn.setMinimumWidth(90)
@@ -705,7 +3040,20 @@ if PYSIDE_AVAILABLE:
             center_layout.addWidget(self.search_input)
             center_layout.addWidget(self.filter_category)
             center_layout.addWidget(self.filter_rating)
+            center_layout.addWidget(self.live_filter)
             center_layout.addWidget(self.go_btn)
+            # Cancel + busy indicator, shown only while a search is running
+            self.cancel_btn = QtWidgets.QPushButton("Cancel")
+            self.cancel_btn.setMinimumWidth(90)
+            self.cancel_btn.setStyleSheet("background-color:#ef4444;color:#ffffff;border-radius:10px;padding:8px 14px;font-weight:700;")
+            self.cancel_btn.setVisible(False)
+            center_layout.addWidget(self.cancel_btn)
+            self.search_progress = QtWidgets.QProgressBar()
+            self.search_progress.setRange(0, 0)
+            self.search_progress.setMaximumWidth(120)
+            self.search_progress.setTextVisible(False)
+            self.search_progress.setVisible(False)
+            center_layout.addWidget(self.search_progress)
             header_layout.addWidget(center_widget, 1)  # give center area stretch
 
             # Right: status pill + last-updated + sync button
@@ -762,14 +3110,15 @@ if PYSIDE_AVAILABLE:
                     pass
             except Exception:
                 pass
-            # small Sync/Import button
-            # sync_btn = QtWidgets.QPushButton("Sync")
-            # sync_btn.setMaximumWidth(90)
-            # try:
-            #     sync_btn.clicked.connect(self.auto_import_yelp_if_needed)
-            # except Exception:
-            #     pass
-            # right_col.addWidget(sync_btn, 0, QtCore.Qt.AlignRight)
+            # small Sync button: incremental refresh from the Yelp file
+            try:
+                self.sync_btn = QtWidgets.QPushButton("Sync")
+                self.sync_btn.setMaximumWidth(90)
+                self.sync_btn.setStyleSheet("background-color:#0ea5a4;color:#081225;border-radius:8px;padding:6px 10px;font-weight:700;")
+                self.sync_btn.clicked.connect(self.refresh_yelp_qt)
+                right_col.addWidget(self.sync_btn, 0, QtCore.Qt.AlignRight)
+            except Exception:
+                pass
 
             header_layout.addLayout(right_col)
 
@@ -883,6 +3232,30 @@ if PYSIDE_AVAILABLE:
             # mapping for favorites table
             self._fav_star_buttons = {}
             self._fav_row_to_bid = {}
+            # background search state (see header_combined_search)
+            self._search_id = 0
+            self._search_running = False
+            self._search_cancel = threading.Event()
+            self._review_cancel = threading.Event()
+            # columnar view of self.businesses used by the filters and sorts (see _business_table)
+            self._table_cache = None
+            # word index for name/category/address search (see _business_search_index)
+            self._search_index = SearchIndex()
+            self._search_index_src = None
+            # trigram indexes for typo-tolerant matching (see _fuzzy_matches)
+            self._fuzzy_indexes = {"name": TrigramIndex("name"), "address": TrigramIndex("address")}
+            self._fuzzy_index_src = {}
+            # live filter state (see _run_live_filter): debounce timer, generation id + cancel event for the
+            # running match, the last exact result (refined when the query is extended) and the rows shown
+            self._live_timer = QtCore.QTimer(self)
+            self._live_timer.setSingleShot(True)
+            self._live_timer.setInterval(LIVE_FILTER_DEBOUNCE_MS)
+            self._live_timer.timeout.connect(self._run_live_filter)
+            self._live_id = 0
+            self._live_cancel = threading.Event()
+            self._live_last = None
+            self._live_shown = None
+            self._live_task = None
 
             try:
                 self.table.selectionModel().selectionChanged.connect(lambda s,d,which='main': self._on_selection_changed(s,d,which))
@@ -940,31 +3313,45 @@ if PYSIDE_AVAILABLE:
             # Load
             self.raw = load_data()
             self.businesses = build_businesses(self.raw)
-            self.yelp_categories = extract_yelp_categories(YELP_BUSINESS_FILE)
-            self.yelp_category_strings = extract_yelp_category_strings(YELP_BUSINESS_FILE)
-
-            # populate category dropdown (non-destructive)
-            try:
-                if self.yelp_categories:
-                    self.filter_category.blockSignals(True)
-                    self.filter_category.clear()
-                    self.filter_category.addItem("")
-                    self.filter_category.addItems(sorted(self.yelp_categories))
-                    self.filter_category.blockSignals(False)
-            except Exception:
-                pass
+            # Yelp categories: use the warm cache if present, otherwise scan once in the background
+            self.yelp_categories = []
+            self.yelp_category_strings = []
+            cached = load_cached_yelp_categories(YELP_BUSINESS_FILE)
+            if cached is not None:
+                self._on_yelp_categories_loaded(cached)
+            elif os.path.exists(YELP_BUSINESS_FILE):
+                self._category_task = _BackgroundTask(get_yelp_category_lists, YELP_BUSINESS_FILE)
+                self._category_task.signals.result.connect(self._on_yelp_categories_loaded)
+                QtCore.QThreadPool.globalInstance().start(self._category_task)
 
             # wire header controls: Enter or Go triggers combined import; category/rating still filter local list
             try:
                 self.search_input.returnPressed.connect(self.header_combined_search)
                 self.go_btn.clicked.connect(self.header_combined_search)
+                self.cancel_btn.clicked.connect(self.cancel_search)
                 self.filter_category.currentTextChanged.connect(self.apply_header_filters)
                 self.filter_rating.currentTextChanged.connect(self.apply_header_filters)
+                self.live_filter.textChanged.connect(self._on_live_filter_changed)
             except Exception:
                 pass
 
             self.list_all()
 
+        def _on_yelp_categories_loaded(self, lists):
+            """Store the (categories, category_strings) pair and populate the category dropdown (non-destructive)."""
+            self.yelp_categories, self.yelp_category_strings = lists
+            try:
+                if self.yelp_categories:
+                    current = self.filter_category.currentText()
+                    self.filter_category.blockSignals(True)
+                    self.filter_category.clear()
+                    self.filter_category.addItem("")
+                    self.filter_category.addItems(sorted(self.yelp_categories))
+                    self.filter_category.setEditText(current)
+                    self.filter_category.blockSignals(False)
+            except Exception:
+                pass
+
         def clear_model(self):
             if self.model.rowCount() > 0:
                 self.model.removeRows(0, self.model.rowCount())
@@ -972,18 +3359,31 @@ if PYSIDE_AVAILABLE:
             try:
                 self._star_buttons = {}
                 self._row_to_bid = {}
+                self._live_shown = None
             except Exception:
                 pass
 
         def _business_key(self, b: Business) -> str:
             """Return a stable key for a business based on normalized name and address."""
+            try:
+                return b.stable_key()
+            except Exception:
+                pass
             try:
                 name = getattr(b, 'name', '') or ''
                 addr = getattr(b, 'address', '') or ''
             except Exception:
                 name = ''
                 addr = ''
-            return normalize_name(name) + '|' + normalize_name(addr)
+            return business_key(name, addr)
+
+        def _search_blocks_edits(self) -> bool:
+            """True (with a status note) while a streaming search runs. self.businesses then holds only the
+            provisional rows received so far, and persisting it through raw would replace the saved list."""
+            if not self._search_running:
+                return False
+            self.status_label.setText("Finish or cancel the search before changing favorites or reviews")
+            return True
 
         def _get_fav_keys(self) -> set:
             """Return a set of favorite keys, converting legacy numeric ids if present.
@@ -1012,7 +3412,7 @@ if PYSIDE_AVAILABLE:
             if converted:
                 try:
                     self.raw['favorites'] = list(fav_keys)
-                    save_data(self.raw)
+                    request_save(self.raw)
                 except Exception:
                     pass
             return fav_keys
@@ -1020,6 +3420,8 @@ if PYSIDE_AVAILABLE:
         def _toggle_fav(self, bid: int, btn: QtWidgets.QPushButton):
             """Toggle favorite state for business id and update button appearance.
             Use stable name|address keys and refresh the Favorites tab."""
+            if self._search_blocks_edits():
+                return
             b = find_business(self.businesses, bid)
             if not b:
                 return
@@ -1044,9 +3446,7 @@ if PYSIDE_AVAILABLE:
                     pass
             # persist normalized favorite keys
             try:
-                self.raw['favorites'] = list(fav_keys)
-                persist_businesses(self.raw, self.businesses)
-                save_data(self.raw)
+                save_favorites(self.raw, fav_keys, self.businesses)
             except Exception:
                 pass
             try:
@@ -1061,6 +3461,8 @@ if PYSIDE_AVAILABLE:
 
         def toggle_favorite(self):
             """Toggle favorite for selected business (toolbar button) using stable keys."""
+            if self._search_blocks_edits():
+                return
             b = self.selected_business()
             if b is None:
                 QtWidgets.QMessageBox.warning(self, "Error", "Select a business first.")
@@ -1075,9 +3477,7 @@ if PYSIDE_AVAILABLE:
             else:
                 fav_keys.add(key)
             try:
-                self.raw['favorites'] = list(fav_keys)
-                persist_businesses(self.raw, self.businesses)
-                save_data(self.raw)
+                save_favorites(self.raw, fav_keys, self.businesses)
             except Exception:
                 pass
             # refresh views
@@ -1109,42 +3509,143 @@ if PYSIDE_AVAILABLE:
                 pass
             return star_btn
 
-        def list_all(self):
-            self.clear_model()
-            fav_keys = self._get_fav_keys()
-            for idx, b in enumerate(self.businesses):
-                avg = round(b.avg_rating(), 1)
-                rating_text = f"{avg} ({b.review_count()} reviews)"
-                # create items for columns: star col, name, category, address, rating
-                star_item = QtGui.QStandardItem("★" if self._business_key(b) in fav_keys else "☆")
-                star_item.setEditable(False)
+        def _append_business_row(self, b: Business, fav_keys: set) -> None:
+            """Append one styled row (star, name, category, address, rating) for b to the main model."""
+            avg = round(b.avg_rating(), 1)
+            rating_text = f"{avg} ({b.review_count()} reviews)"
+            is_fav = self._business_key(b) in fav_keys
+            # create items for columns: star col, name, category, address, rating
+            star_item = QtGui.QStandardItem("★" if is_fav else "☆")
+            star_item.setEditable(False)
+            try:
+                color = "#ffd700" if is_fav else "#ffffff"
+                star_item.setForeground(QtGui.QBrush(QtGui.QColor(color)))
+            except Exception:
+                pass
+            name_item = QtGui.QStandardItem(b.name)
+            cat_item = QtGui.QStandardItem(b.category)
+            addr_item = QtGui.QStandardItem(b.address)
+            rating_item = QtGui.QStandardItem(rating_text)
+            # style name/category/address/rating
+            for it in (name_item, cat_item, addr_item, rating_item):
                 try:
-                    color = "#ffd700" if self._business_key(b) in fav_keys else "#ffffff"
-                    star_item.setForeground(QtGui.QBrush(QtGui.QColor(color)))
+                    it.setEditable(False)
+                    it.setBackground(QtGui.QColor("#23272e"))
+                    it.setForeground(QtGui.QBrush(QtGui.QColor("#f5f6fa")))
                 except Exception:
                     pass
-                name_item = QtGui.QStandardItem(b.name)
-                cat_item = QtGui.QStandardItem(b.category)
-                addr_item = QtGui.QStandardItem(b.address)
-                rating_item = QtGui.QStandardItem(rating_text)
-                # style name/category/address/rating
-                for it in (name_item, cat_item, addr_item, rating_item):
-                    try:
-                        it.setEditable(False)
-                        it.setBackground(QtGui.QColor("#23272e"))
-                        it.setForeground(QtGui.QBrush(QtGui.QColor("#f5f6fa")))
-                    except Exception:
-                        pass
-                row = [star_item, name_item, cat_item, addr_item, rating_item]
-                self.model.appendRow(row)
+            row = [star_item, name_item, cat_item, addr_item, rating_item]
+            self.model.appendRow(row)
+            try:
+                self._row_to_bid[self.model.rowCount() - 1] = b.id
+            except Exception:
+                pass
+
+        def _business_search_index(self) -> SearchIndex:
+            """Word index kept in step with self.businesses (sync re-indexes only changed records)."""
+            index = self._search_index
+            if self._search_index_src is not self.businesses or len(index) != len(self.businesses):
+                index.sync(self.businesses)
+                self._search_index_src = self.businesses
+            return index
+
+        def _fuzzy_matches(self, query: str, include_address: bool = False, k: int = FUZZY_TOP_K) -> Dict[int, float]:
+            """{business id: similarity} for the k businesses whose name (and optionally address) is closest to query."""
+            best: Dict[int, float] = {}
+            for attr in ("name", "address") if include_address else ("name",):
+                index = self._fuzzy_indexes[attr]
+                if self._fuzzy_index_src.get(attr) is not self.businesses or len(index) != len(self.businesses):
+                    index.sync(self.businesses)
+                    self._fuzzy_index_src[attr] = self.businesses
+                for sim, b in index.similar(query, k):
+                    if sim > best.get(b.id, 0.0):
+                        best[b.id] = sim
+            return dict(heapq.nlargest(k, best.items(), key=lambda item: item[1]))
+
+        def _on_live_filter_changed(self, _text: str) -> None:
+            """Restart the debounce timer and stop any match still running for an older keystroke."""
+            self._live_id += 1
+            self._live_cancel.set()
+            self._live_timer.start()
+
+        def _run_live_filter(self) -> None:
+            """Match the live filter text on the thread pool. When the text extends the query of the last
+            exact result (and the index has not changed since), only those hits are re-checked."""
+            query = self.live_filter.text().strip()
+            self._live_id += 1
+            self._live_cancel.set()
+            self._live_cancel = threading.Event()
+            if not search_terms(query):
+                self._live_last = None
+                self.list_all()
+                self.status_label.setText("Ready")
+                return
+            index = self._business_search_index()
+            candidates = None
+            last = self._live_last
+            if last is not None and last[1] == index.version and query.lower().startswith(last[0].lower()):
+                candidates = last[2]
+            live_id, version, cancel = self._live_id, index.version, self._live_cancel
+            self._live_task = _BackgroundTask(index.match, query, SEARCH_ALL_FIELDS, candidates, cancel)
+            # a cancelled match returns {} early; never show or keep it as the base for refining
+            self._live_task.signals.result.connect(
+                lambda scores: None if cancel.is_set() else self._on_live_filter_result(live_id, query, version, scores))
+            self._live_task.signals.error.connect(
+                lambda msg: log(f"Live filter failed for '{query}': {msg}", logging.WARNING))
+            QtCore.QThreadPool.globalInstance().start(self._live_task)
+
+        def _on_live_filter_result(self, live_id: int, query: str, version: int, scores: Dict[int, float]) -> None:
+            """Show the best LIVE_FILTER_MAX_ROWS hits for query; results of superseded keystrokes are dropped."""
+            if live_id != self._live_id:
+                return
+            index = self._search_index
+            if version == index.version:
+                self._live_last = (query, version, list(scores))
+            fuzzy = False
+            if not scores:
+                # no word matches: closest names/addresses instead (typos, missing spaces)
+                scores = self._fuzzy_matches(query, include_address=True)
+                fuzzy = True
+            businesses = index.businesses
+            ranked = heapq.nlargest(LIVE_FILTER_MAX_ROWS, (bid for bid in scores if bid in businesses),
+                                    key=lambda bid: (scores[bid], businesses[bid].avg_rating()))
+            if ranked != self._live_shown:
+                self.table.setUpdatesEnabled(False)
                 try:
-                    r = self.model.rowCount() - 1
-                    try:
-                        self._row_to_bid[r] = b.id
-                    except Exception:
-                        pass
-                except Exception:
-                    pass
+                    self.clear_model()
+                    fav_keys = self._get_fav_keys()
+                    for bid in ranked:
+                        self._append_business_row(businesses[bid], fav_keys)
+                finally:
+                    self.table.setUpdatesEnabled(True)
+                self._live_shown = ranked
+            if fuzzy:
+                self.status_label.setText(f"No exact match for '{query}'; showing closest names" if ranked
+                                          else f"No matches for '{query}'")
+            else:
+                self.status_label.setText(f"Filter '{query}': showing {len(ranked)} of {len(scores)} matches")
+
+        def _business_table(self) -> BusinessTable:
+            """Columnar table for the current self.businesses, rebuilt when the list is replaced or resized."""
+            table = self._table_cache
+            if table is None or table.businesses is not self.businesses or len(table) != len(self.businesses):
+                table = self._table_cache = BusinessTable(self.businesses)
+            return table
+
+        def list_all(self):
+            """List every business, or re-apply the live filter while its box holds a query
+            (handlers call this after favorites, reviews, imports and syncs)."""
+            live = getattr(self, "live_filter", None)
+            if live is not None and search_terms(live.text()):
+                self._live_timer.stop()
+                # same ids may come back with changed stars/ratings, so force a redraw
+                self._live_shown = None
+                self._run_live_filter()
+                return
+            self.clear_model()
+            fav_keys = self._get_fav_keys()
+            for b in self.businesses:
+                self._append_business_row(b, fav_keys)
 
         def list_favorites(self):
             """List businesses in the favorites table."""
@@ -1216,13 +3717,15 @@ if PYSIDE_AVAILABLE:
             else:
                 cat_variants.add(cat_q + "s")
 
-            filtered = []
-            for b in self.businesses:
-                if cat_q and not any(v in b.category.lower() for v in cat_variants):
-                    continue
-                if min_rating is not None and round(b.avg_rating()) < min_rating:
-                    continue
-                filtered.append(b)
+            table = self._business_table()
+            if cat_q and not any("," in v for v in cat_variants):
+                # a comma-free variant can only match inside one category token, so use the token postings
+                rows = table.filter(min_rating=min_rating, round_rating=True,
+                                    category_token=lambda t: any(v in t.lower() for v in cat_variants))
+            else:
+                rows = table.filter(min_rating=min_rating, round_rating=True,
+                                    category=(lambda c: any(v in c.lower() for v in cat_variants)) if cat_q else None)
+            filtered = table.rows(rows)
 
             self.clear_model()
             fav_keys = self._get_fav_keys()
@@ -1259,37 +3762,182 @@ if PYSIDE_AVAILABLE:
 
         def header_combined_search(self):
             """Run combined search/import using the top Location and Category inputs (like Combined Search button).
-            This will fetch from Yelp and OSM, merge, filter big chains, and overwrite current data file with results.
+            Yelp and OSM run on the Qt thread pool; rows stream into the table as each source produces them.
+            When both sources finish, the merged, chain-filtered results overwrite the current data file.
+            Each source's results are reused from SearchResultCache while fresh; the status line marks cache hits.
             """
             location = self.search_input.text().strip()
             category = self.filter_category.currentText().strip()
             if not location:
                 QtWidgets.QMessageBox.warning(self, "Input Needed", "Please enter a location (city or area) in the top field.")
                 return
+            if self._search_running:
+                self.cancel_search()
             limit = 50
             broad_osm_tags = "restaurant|cafe|bar|fast_food|pub|coffee|food|bakery|ice_cream|deli|restaurant;food"
             tags_for_osm = normalize_osm_tags(category) if category else broad_osm_tags
-            # Yelp search: pass category filter for partial match
-            yelp_items = import_yelp_academic_businesses(YELP_BUSINESS_FILE, location, limit, category_filter=category if category else None)
-            # OSM search
-            osm_items = []
+
+            def run_yelp(emit_rows, emit_progress, cancel):
+                # Yelp search: pass category filter for partial match
+                if not os.path.exists(YELP_BUSINESS_FILE):
+                    emit_progress("dataset not found")
+                    return
+                # radius search around the geocoded point; fall back to matching the city name
+                emit_progress("geocoding")
+                center = geocode_location(location)
+                if center is not None and get_yelp_geo_index(YELP_BUSINESS_FILE) is None:
+                    center = None
+                # the dataset's size/mtime and the search mode are part of the key, so a new file misses
+                cache = get_search_cache()
+                cache_key = SearchResultCache.make_key(
+                    "yelp", location, category, limit,
+                    (_file_identity(YELP_BUSINESS_FILE), YELP_SEARCH_RADIUS_KM if center else None))
+                cached = cache.get("yelp", cache_key) if cache is not None else None
+                if cached is not None:
+                    emit_progress("cached")
+                    emit_rows(cached)
+                    return
+                emit_progress(f"scanning within {YELP_SEARCH_RADIUS_KM:g} km" if center else "scanning")
+                found = []
+                for batch in iter_yelp_search_batches(YELP_BUSINESS_FILE, location, category, limit, cancel=cancel, center=center):
+                    found.extend(batch)
+                    emit_rows(batch)
+                if cache is not None and not cancel.is_set():
+                    cache.put("yelp", cache_key, found)
+
+            def run_osm(emit_rows, emit_progress, cancel):
+                items = fetch_from_overpass(location, tags_for_osm, limit, progress=emit_progress)
+                if not cancel.is_set():
+                    emit_rows(items)
+
+            self._search_id += 1
+            self._search_cancel = threading.Event()
+            self._search_items = {"yelp": [], "osm": []}
+            self._search_status = {"yelp": "starting", "osm": "starting"}
+            self._search_pending = {"yelp", "osm"}
+            self._search_seen = set()
+            self._search_cached = set()
+            # Preserve existing favorites (normalized keys) when saving combined results
             try:
-                osm_items = fetch_from_overpass(location, tags_for_osm, limit)
-            except Exception as e:
-                log(f"header_combined_search OSM failure: {e}")
-                QtWidgets.QMessageBox.warning(self, "OSM Error", str(e))
+                self._search_prev_favs = self._get_fav_keys()
+            except Exception:
+                self._search_prev_favs = set()
+            self.businesses = []
+            self.clear_model()
+            self._set_search_running(True)
+            pool = QtCore.QThreadPool.globalInstance()
+            # keep references so the signal objects outlive the runnables
+            self._search_tasks = []
+            for source, fn in (("yelp", run_yelp), ("osm", run_osm)):
+                task = _SearchSourceTask(self._search_id, source, fn, self._search_cancel)
+                task.signals.rows.connect(self._on_search_rows)
+                task.signals.progress.connect(self._on_search_progress)
+                task.signals.error.connect(self._on_search_error)
+                task.signals.finished.connect(self._on_search_source_finished)
+                self._search_tasks.append(task)
+                pool.start(task)
+
+        def _set_search_running(self, running: bool) -> None:
+            self._search_running = running
+            try:
+                self.go_btn.setEnabled(not running)
+                self.cancel_btn.setVisible(running)
+                self.search_progress.setVisible(running)
+                self.status_label.setText("Searching..." if running else "Ready")
+                # a Yelp sync would merge into the provisional list (see _search_blocks_edits)
+                self.sync_btn.setEnabled(not running)
+            except Exception:
+                pass
+
+        def _on_search_rows(self, search_id: int, source: str, items: list) -> None:
+            """Append newly arrived rows (deduplicated, chains removed) to the table as provisional businesses."""
+            if search_id != self._search_id:
+                return
+            self._search_items[source].extend(items)
+            fav_keys = self._search_prev_favs
+            for item in items:
+                key = (item.get("name", "").strip().lower(), item.get("address", "").strip().lower())
+                if key in self._search_seen or is_big_chain(item.get("name", "")):
+                    continue
+                self._search_seen.add(key)
+                entry = dict(item)
+                entry["id"] = len(self.businesses) + 1
+                b = build_businesses({"businesses": [entry]})[0]
+                self.businesses.append(b)
+                self._append_business_row(b, fav_keys)
+            self._search_status[source] = f"{len(self._search_items[source])} rows"
+            if source in self._search_cached:
+                self._search_status[source] += " (cached)"
+            self._update_search_status()
+
+        def _on_search_progress(self, search_id: int, source: str, msg: str) -> None:
+            if search_id != self._search_id:
+                return
+            if msg == "cached":
+                self._search_cached.add(source)
+            self._search_status[source] = msg
+            self._update_search_status()
+
+        def _update_search_status(self) -> None:
+            try:
+                self.status_label.setText(f"Yelp: {self._search_status['yelp']} | OSM: {self._search_status['osm']}")
+            except Exception:
+                pass
+
+        def _on_search_error(self, search_id: int, source: str, msg: str) -> None:
+            if search_id != self._search_id:
+                return
+            log(f"header_combined_search {source} failure: {msg}")
+            self._search_status[source] = "failed"
+            if source == "osm":
+                QtWidgets.QMessageBox.warning(self, "OSM Error", msg)
+
+        def _on_search_source_finished(self, search_id: int, source: str) -> None:
+            if search_id != self._search_id:
+                return
+            self._search_pending.discard(source)
+            if not self._search_pending:
+                self._finish_search()
+
+        def cancel_search(self) -> None:
+            """Stop the running search, ignore any late results and restore the previous list."""
+            if not self._search_running:
+                return
+            self._search_cancel.set()
+            self._search_id += 1
+            self._set_search_running(False)
+            self.status_label.setText("Search cancelled")
+            self.businesses = build_businesses(self.raw)
+            self.list_all()
+
+        def closeEvent(self, event):
+            # stop any running Yelp scan so the thread pool can shut down promptly
+            try:
+                self._search_cancel.set()
+                self._review_cancel.set()
+            except Exception:
+                pass
+            flush_saves()
+            super().closeEvent(event)
+
+        def _finish_search(self) -> None:
+            """Merge both sources (Yelp first, as before) and overwrite the data file with the combined results."""
+            self._set_search_running(False)
             # Merge results, avoiding duplicates
             seen = set()
             combined = []
-            for item in yelp_items + osm_items:
+            for item in self._search_items["yelp"] + self._search_items["osm"]:
                 key = (item.get("name", "").strip().lower(), item.get("address", "").strip().lower())
                 if key in seen:
                     continue
                 seen.add(key)
                 combined.append(item)
             # filter out big chains
-            combined = [item for item in combined if not is_big_chain(item.get("name", ""))]
+            chain_flags = is_big_chain_many([item.get("name", "") for item in combined])
+            combined = [item for item, chain in zip(combined, chain_flags) if not chain]
             if not combined:
+                self.businesses = build_businesses(self.raw)
+                self.list_all()
                 QtWidgets.QMessageBox.information(
                     self,
                     "No Results",
@@ -1297,14 +3945,9 @@ if PYSIDE_AVAILABLE:
                 )
                 return
             # Overwrite with only the combined results
-            # Preserve existing favorites (normalized keys) when saving combined results
-            try:
-                prev_fav_keys = self._get_fav_keys()
-            except Exception:
-                prev_fav_keys = set()
-            raw = {"businesses": combined, "favorites": list(prev_fav_keys)}
+            raw = {"businesses": combined, "favorites": list(self._search_prev_favs)}
             ensure_numeric_ids_for_raw(raw)
-            save_data(raw)
+            request_save(raw)
             self.raw = raw
             self.businesses = build_businesses(self.raw)
             self.list_all()
@@ -1312,7 +3955,44 @@ if PYSIDE_AVAILABLE:
                 self.list_favorites()
             except Exception:
                 pass
+            cached = " and ".join(name for src, name in (("yelp", "Yelp"), ("osm", "OSM")) if src in self._search_cached)
+            self.status_label.setText(f"Imported {len(combined)} businesses" + (f" ({cached} from cache)" if cached else ""))
+            cache = get_search_cache()
+            if cache is not None:
+                log(f"Search cache hits/misses: {cache.stats()}")
             QtWidgets.QMessageBox.information(self, "Search Complete", f"Imported {len(combined)} businesses from Yelp and OSM.")
+            self._start_yelp_review_import([b.get("external_id") for b in combined if b.get("external_id")])
+
+        def _start_yelp_review_import(self, business_ids) -> None:
+            """Stream real Yelp reviews for business_ids on the thread pool, if the review file is installed."""
+            if not business_ids or not os.path.exists(YELP_REVIEW_FILE):
+                return
+            self._review_cancel.set()
+            self._review_cancel = threading.Event()
+            self._review_task = _BackgroundTask(get_yelp_review_aggregates, YELP_REVIEW_FILE, business_ids,
+                                                YELP_REVIEWS_PER_BUSINESS, self._review_cancel)
+            self._review_task.signals.result.connect(self._on_yelp_reviews_loaded)
+            self._review_task.signals.error.connect(lambda msg: log(f"Yelp review import failed: {msg}"))
+            self.status_label.setText("Loading Yelp reviews...")
+            QtCore.QThreadPool.globalInstance().start(self._review_task)
+
+        def _on_yelp_reviews_loaded(self, aggregates) -> None:
+            if self._search_running:
+                # a newer search replaced the list; its own review import will follow
+                return
+            persist_businesses(self.raw, self.businesses)
+            updated = apply_yelp_review_aggregates(self.raw, aggregates)
+            if not updated:
+                self.status_label.setText("Ready")
+                return
+            request_save(self.raw)
+            self.businesses = build_businesses(self.raw)
+            self.list_all()
+            try:
+                self.list_favorites()
+            except Exception:
+                pass
+            self.status_label.setText(f"Yelp reviews loaded for {updated} businesses")
 
         def selected_business(self) -> Optional[Business]:
             """Return the currently selected Business from the main table or None."""
@@ -1341,13 +4021,57 @@ if PYSIDE_AVAILABLE:
                 return
 
             added = integrate_yelp_results(self.raw, items)
-            save_data(self.raw)
+            request_save(self.raw)
 
             self.businesses = build_businesses(self.raw)
             self.list_all()
 
+        def refresh_yelp_qt(self):
+            """Re-import only new or changed Yelp records (see scan_yelp_changes) without blocking the UI."""
+            if not os.path.exists(YELP_BUSINESS_FILE):
+                QtWidgets.QMessageBox.information(self, "Sync", "The Yelp dataset file was not found.")
+                return
+            known = [b.external_id for b in self.businesses if b.external_id]
+            city = self.search_input.text().strip()
+            category = self.filter_category.currentText().strip() or None
+            self.sync_btn.setEnabled(False)
+            # without a location only businesses already in the list are updated (see scan_yelp_changes)
+            self.status_label.setText("Syncing Yelp data..." if city else "Syncing Yelp data (no location: updating known businesses only)...")
+            self._sync_task = _BackgroundTask(scan_yelp_changes, YELP_BUSINESS_FILE, known, city, category)
+            self._sync_task.signals.result.connect(self._on_yelp_changes_scanned)
+            self._sync_task.signals.error.connect(self._on_yelp_sync_failed)
+            QtCore.QThreadPool.globalInstance().start(self._sync_task)
+
+        def _on_yelp_sync_failed(self, msg: str) -> None:
+            self.sync_btn.setEnabled(True)
+            self.status_label.setText("Ready")
+            log(f"Yelp sync failed: {msg}")
+            QtWidgets.QMessageBox.warning(self, "Sync", f"Yelp sync failed: {msg}")
+
+        def _on_yelp_changes_scanned(self, result) -> None:
+            items, manifest, stats = result
+            self.sync_btn.setEnabled(not self._search_running)
+            if self._search_blocks_edits():
+                # the manifest is not saved either, so the next sync rescans these changes
+                return
+            persist_businesses(self.raw, self.businesses)
+            inserted, updated = apply_yelp_changes(self.raw, items)
+            if inserted or updated:
+                request_save(self.raw)
+                self.businesses = build_businesses(self.raw)
+                self.list_all()
+                try:
+                    self.list_favorites()
+                except Exception:
+                    pass
+            save_yelp_manifest(YELP_BUSINESS_FILE, manifest)
+            self.status_label.setText(f"Synced: {inserted} new, {updated} updated ({stats['mode']} scan)")
+
         def sort_by_rating(self):
-            self.businesses.sort(key=lambda b: b.avg_rating(), reverse=True)  # sort businesses by desc average rating
+            table = self._business_table()
+            order = table.argsort_rating(descending=True)  # stable, like list.sort(key=avg_rating, reverse=True)
+            self._table_cache = table.take(order)
+            self.businesses = self._table_cache.businesses
             self.list_all()  # refresh table
 
         def show_deals(self):
@@ -1359,31 +4083,10 @@ if PYSIDE_AVAILABLE:
                 QtWidgets.QMessageBox.information(self, "No Deal", f"No deal available for '{b.name}'.")
                 return
             QtWidgets.QMessageBox.information(self, "Deal", f"Deal for '{b.name}':\n\n{b.deal}")
-        def toggle_favorite(self):
-            b = self.selected_business()
-            if b is None:
-                QtWidgets.QMessageBox.warning(self, "Error", "Select a business first.")  # show warning when no selection
-                return
-            favs = self.raw.setdefault("favorites", [])  # get or create favorites list
-            if b.id in favs:
-                favs.remove(b.id)  # remove id if already a favorite
-            else:
-                favs.append(b.id)  # add id to favorites
-            try:
-                self.raw['favorites'] = favs
-                persist_businesses(self.raw, self.businesses)
-                save_data(self.raw)
-            except Exception:
-                pass
-            # refresh views
-            self.businesses = build_businesses(self.raw)
-            self.list_all()
-            try:
-                self.list_favorites()
-            except Exception:
-                pass
 
         def add_review_qt(self):
+            if self._search_blocks_edits():
+                return
             b = self.selected_business()
             if b is None:
                 QtWidgets.QMessageBox.warning(self, "Error", "Select a business first.")  # require selection
@@ -1459,13 +4162,26 @@ if PYSIDE_AVAILABLE:
             if not ok or not review_text.strip():
                 return
 
-            b.reviews.append(Review(rating=rating, text=review_text.strip()))
+            review = Review(rating=rating, text=review_text.strip())
+            b.add_review(review)
+            self._table_cache = None
             persist_businesses(self.raw, self.businesses)
+            save_review(self.raw, b, review)
             self.list_all()
 
         def save_now_qt(self):
+            if self._search_blocks_edits():
+                return
             persist_businesses(self.raw, self.businesses)
-            save_data(self.raw)
+            request_save(self.raw)
+            flush_saves()
+            if STORAGE_BACKEND == "sqlite":
+                try:
+                    export_data_json(self.raw)
+                except Exception as e:
+                    log(f"JSON export failed: {e}", logging.ERROR)
+                QtWidgets.QMessageBox.information(self, "Saved", "Saved to SQLite and exported JSON!")
+                return
             QtWidgets.QMessageBox.information(self, "Saved", "Saved to JSON!")
 
         def import_from_osm(self):
@@ -1498,7 +4214,7 @@ if PYSIDE_AVAILABLE:
                 prev_fav_keys = set()
             raw = {"businesses": items, "favorites": list(prev_fav_keys)}
             ensure_numeric_ids_for_raw(raw)
-            save_data(raw)
+            request_save(raw)
             self.raw = raw
             self.businesses = build_businesses(self.raw)
             self.list_all()
@@ -1529,7 +4245,7 @@ if PYSIDE_AVAILABLE:
             if tags_for_osm.lower() in ["restaurant|cafe|bar", "restaurant"]:
                 tags_for_osm = broad_osm_tags
             # Yelp search: pass category filter for partial match
-            yelp_items = import_yelp_academic_businesses(YELP_BUSINESS_FILE, location.strip(), limit, category_filter=category.strip())
+            yelp_items = import_yelp_academic_businesses(YELP_BUSINESS_FILE, location.strip(), limit, category_filter=category.strip(), workers=None)
             # OSM search
             osm_items = fetch_from_overpass(location.strip(), tags_for_osm, limit)
             # Show debug counts
@@ -1544,7 +4260,8 @@ if PYSIDE_AVAILABLE:
                 seen.add(key)
                 combined.append(item)
             # filter out big chains from combined results
-            combined = [item for item in combined if not is_big_chain(item.get("name", ""))]
+            chain_flags = is_big_chain_many([item.get("name", "") for item in combined])
+            combined = [item for item, chain in zip(combined, chain_flags) if not chain]
             if not combined:
                 QtWidgets.QMessageBox.information(
                     self,
@@ -1560,7 +4277,7 @@ if PYSIDE_AVAILABLE:
                 prev_fav_keys = set()
             raw = {"businesses": combined, "favorites": list(prev_fav_keys)}
             ensure_numeric_ids_for_raw(raw)
-            save_data(raw)
+            request_save(raw)
             self.raw = raw
             self.businesses = build_businesses(self.raw)
             self.list_all()
@@ -1579,6 +4296,8 @@ if PYSIDE_AVAILABLE:
                 QtWidgets.QMessageBox.information(self, "No Reviews", f"No reviews for '{b.name}'.")
                 return
             msg = f"Reviews for '{b.name}':\n\n"
+            if b.review_count() > len(b.reviews):
+                msg += f"Showing {len(b.reviews)} of {b.review_count()} reviews (average {b.avg_rating():.2f})\n\n"
             for r in b.reviews:
                 msg += f"Rating: {r.rating}\n{r.text}\n---\n"
             QtWidgets.QMessageBox.information(self, "Reviews", msg)
@@ -1589,26 +4308,48 @@ if PYSIDE_AVAILABLE:
             if total == 0:
                 QtWidgets.QMessageBox.information(self, "Stats", "No businesses loaded.")
                 return
-            avg_rating = round(sum(b.avg_rating() for b in self.businesses) / total, 2)
-            # Top categories
+            table = self._business_table()
+            avg_rating = round(sum(table.ratings) / total, 2)
+            # Top categories (counts are the lengths of the per-category posting lists)
             from collections import Counter
-            cat_counter = Counter()
-            for b in self.businesses:
-                for cat in b.category.split(","):
-                    cat_counter[cat.strip()] += 1
+            cat_counter = Counter(table.category_counts())
             top_cats = ", ".join([f"{cat} ({count})" for cat, count in cat_counter.most_common(3)])
             # Most reviewed business
-            most_reviewed = max(self.businesses, key=lambda b: b.review_count(), default=None)
+            most_reviewed = table.businesses[max(range(total), key=table.review_counts.__getitem__)]
             most_reviewed_str = f"{most_reviewed.name} ({most_reviewed.review_count()} reviews)" if most_reviewed else "N/A"
             # Rating distribution
             rating_dist = Counter()
             for b in self.businesses:
-                for r in b.reviews:
-                    rating_dist[r.rating] += 1
+                rating_dist.update(b.rating_histogram())
             dist_str = ", ".join([f"{k}: {v}" for k, v in sorted(rating_dist.items())])
             msg = f"Total businesses: {total}\nAverage rating: {avg_rating}\nTop categories: {top_cats}\nMost reviewed: {most_reviewed_str}\nRating distribution: {dist_str}"
             QtWidgets.QMessageBox.information(self, "Stats", msg)
 
+        def _smart_filter_matches(self, min_rating: float, category_q: str, name_q: str) -> List[Business]:
+            """Businesses rated at least min_rating whose category/name contain every word of the queries
+            (as word prefixes, via the search index), best text match first; list order without text queries.
+            A name query without any word match falls back to trigram similarity."""
+            table = self._business_table()
+            rows = table.filter(min_rating=min_rating if min_rating > 0 else None)
+            index = self._business_search_index()
+            scores = None
+            for query, field_bit in ((category_q, SEARCH_FIELD_CATEGORY), (name_q, SEARCH_FIELD_NAME)):
+                hits = index.match(query, field_bit)
+                if hits is None:
+                    continue
+                if not hits and field_bit == SEARCH_FIELD_NAME:
+                    # no word matches: fall back to the closest names (typos, missing spaces)
+                    hits = self._fuzzy_matches(query)
+                    if hits:
+                        self.status_label.setText(f"No exact name match for '{query}'; showing closest names")
+                scores = hits if scores is None else {bid: sc + hits[bid] for bid, sc in scores.items() if bid in hits}
+            filtered = table.rows(rows)
+            if scores is None:
+                return filtered
+            filtered = [b for b in filtered if b.id in scores]
+            filtered.sort(key=lambda b: -scores[b.id])
+            return filtered
+
         def smart_filter(self):
             dlg = QtWidgets.QDialog(self)
             dlg.setWindowTitle("Smart Filter")
@@ -1643,23 +4384,7 @@ if PYSIDE_AVAILABLE:
             category_val = cat_input.text().strip().lower()
             name_val = name_input.text().strip().lower()
 
-            filtered = []
-
-            for b in self.businesses:
-                business_name = str(b.name).lower().strip()
-                business_category = str(b.category).lower().strip()
-                business_rating = b.avg_rating()
-
-                if min_rating_val > 0 and business_rating < min_rating_val:
-                    continue
-
-                if category_val and category_val not in business_category:
-                    continue
-
-                if name_val and name_val not in business_name:
-                    continue
-
-                filtered.append(b)
+            filtered = self._smart_filter_matches(min_rating_val, category_val, name_val)
 
             QtWidgets.QMessageBox.information(
                 self,
@@ -1667,78 +4392,6 @@ if PYSIDE_AVAILABLE:
                 f"Found {len(filtered)} matching businesses."
             )
 
-            if not filtered:
-                QtWidgets.QMessageBox.information(self, "Smart Filter", "No businesses match your criteria.")
-                return
-
-            self.clear_model()
-            fav_keys = self._get_fav_keys()
-
-            for b in filtered:
-                avg = round(b.avg_rating(), 1)
-                rating_text = f"{avg} ({b.review_count()} reviews)"
-
-                star_item = QtGui.QStandardItem("★" if self._business_key(b) in fav_keys else "☆")
-                name_item = QtGui.QStandardItem(b.name)
-                cat_item = QtGui.QStandardItem(b.category)
-                addr_item = QtGui.QStandardItem(b.address)
-                rating_item = QtGui.QStandardItem(rating_text)
-
-                for it in (star_item, name_item, cat_item, addr_item, rating_item):
-                    it.setEditable(False)
-                    it.setBackground(QtGui.QColor("#23272e"))
-                    it.setForeground(QtGui.QBrush(QtGui.QColor("#f5f6fa")))
-
-                self.model.appendRow([star_item, name_item, cat_item, addr_item, rating_item])
-            def _normalize(s: str) -> str:
-                try:
-                    return re.sub(r"\s+", " ", (s or "").strip().lower())
-                except Exception:
-                    return (s or "").strip().lower()
-
-                    category_val = _normalize(category_val)
-                    name_val = _normalize(name_val)
-
-            def matches_category(b: Business, q: str) -> bool:
-                if not q:
-                    return True
-                try:
-                    cat_text = _normalize(getattr(b, 'category', '') or '')
-                    # direct substring match
-                    if q in cat_text:
-                        return True
-                    # split common separators and match tokens
-                    for token in re.split(r"[,/|;]+", cat_text):
-                        if q in token.strip():
-                            return True
-                except Exception:
-                    pass
-                return False
-
-            def matches_name(b: Business, q: str) -> bool:
-                if not q:
-                    return True
-                try:
-                    name_text = _normalize(getattr(b, 'name', '') or '')
-                    if q in name_text:
-                        return True
-                except Exception:
-                    pass
-                return False
-
-            filtered = []
-            for b in self.businesses:
-                try:
-                    if b.avg_rating() < min_rating_val:
-                        continue
-                    if not matches_category(b, category_val):
-                        continue
-                    if not matches_name(b, name_val):
-                        continue
-                    filtered.append(b)
-                except Exception:
-                    continue
-
             if not filtered:
                 QtWidgets.QMessageBox.information(self, "Smart Filter", "No businesses match your criteria.")
                 return
@@ -1833,15 +4486,20 @@ if PYSIDE_AVAILABLE:
 
         def _on_table_clicked(self, index, which='main'):
             """Handle clicks in the table. Toggle favorite when left star column clicked."""
+            if index.column() == 0 and self._search_blocks_edits():
+                return
             try:
                 # Only handle clicks on the star column (index 0)
                 if index.column() != 0:
                     return
                 row = index.row()
-                # Derive business and its stable key from the currently displayed businesses list
-                if row is None or not (0 <= row < len(self.businesses)):
-                    return
-                b = self.businesses[row]
+                # Derive business and its stable key from the displayed row (filtered views show a subset)
+                bid = self._row_to_bid.get(row)
+                b = find_business(self.businesses, bid) if bid is not None else None
+                if b is None:
+                    if row is None or not (0 <= row < len(self.businesses)):
+                        return
+                    b = self.businesses[row]
                 key = self._business_key(b)
                 fav_keys = set(self._get_fav_keys())
                 if key in fav_keys:
@@ -1852,9 +4510,7 @@ if PYSIDE_AVAILABLE:
                 else:
                     fav_keys.add(key)
                 # write normalized back to raw
-                self.raw["favorites"] = list(fav_keys)
-                persist_businesses(self.raw, self.businesses)
-                save_data(self.raw)
+                save_favorites(self.raw, fav_keys, self.businesses)
                 # refresh view
                 self.businesses = build_businesses(self.raw)
                 self.list_all()
@@ -1885,9 +4541,7 @@ if PYSIDE_AVAILABLE:
                     else:
                         fav_keys.add(key)
                     # write normalized back to raw
-                    self.raw["favorites"] = list(fav_keys)
-                    persist_businesses(self.raw, self.businesses)
-                    save_data(self.raw)
+                    save_favorites(self.raw, fav_keys, self.businesses)
                     # refresh view
                     self.businesses = build_businesses(self.raw)
                     self.list_favorites()
@@ -1964,23 +4618,17 @@ if PYSIDE_AVAILABLE:
             if total == 0:
                 QtWidgets.QMessageBox.information(self, "Report", "No businesses loaded.")
                 return
-            avg_rating = round(sum(b.avg_rating() for b in self.businesses) / total, 2)
-            cat_counter = Counter()
-            for b in self.businesses:
-                for cat in str(b.category).split(","):
-                    cat_counter[cat.strip().lower()] += 1
+            table = self._business_table()
+            avg_rating = round(sum(table.ratings) / total, 2)
+            cat_counter = Counter(table.category_counts(lower=True))
             top_cats = ", ".join([f"{cat} ({count})" for cat, count in cat_counter.most_common(5)])
-            most_reviewed = max(self.businesses, key=lambda b: b.review_count(), default=None)
+            most_reviewed = table.businesses[max(range(total), key=table.review_counts.__getitem__)]
             most_reviewed_str = f"{most_reviewed.name} ({most_reviewed.review_count()} reviews)" if most_reviewed else "N/A"
             rating_dist = Counter()
             for b in self.businesses:
-                for r in b.reviews:
-                    try:
-                        rating_dist[int(r.rating)] += 1
-                    except Exception:
-                        pass
+                rating_dist.update(b.rating_histogram())
             dist_str = ", ".join([f"{k}: {v}" for k, v in sorted(rating_dist.items())])
-            sorted_by_rating = sorted(self.businesses, key=lambda b: b.avg_rating(), reverse=True)[:10]
+            sorted_by_rating = table.rows(table.argsort_rating(descending=True)[:10])
 
             lines = [
                 f"{PROGRAM_NAME} - SUMMARY REPORT",
@@ -2077,9 +4725,10 @@ def integrate_osm_results(raw: Dict, osm_items: List[Dict]) -> int:
     next_id = max_id + 1
 
     added = 0
-    for item in osm_items:
+    chain_flags = is_big_chain_many([item.get("name", "") for item in osm_items])
+    for item, chain in zip(osm_items, chain_flags):
         # skip big chains coming from OSM
-        if is_big_chain(item.get("name", "")):
+        if chain:
             continue
         ext = item.get("external_id")
         if ext and ext in existing_ext:
@@ -2104,27 +4753,17 @@ def ensure_numeric_ids_for_raw(raw: Dict) -> None:
     """Ensure every business dict in raw['businesses'] has a unique integer 'id'.
     This is used when imported/combined lists are saved without ids so that
     favorites and other id-based operations don't treat them all as the same id (e.g. 0).
-    The function mutates the provided raw dict in place.
+    The function mutates the provided raw dict in place (the business entries are replaced, not edited).
     """
-    raw.setdefault("businesses", [])
-    next_id = 1
-    for b in raw["businesses"]:
-        try:
-            # Always assign a fresh sequential integer id to guarantee uniqueness
-            b["id"] = next_id
-        except Exception:
-            # if something odd happens, still ensure an int id
-            try:
-                b["id"] = int(next_id)
-            except Exception:
-                b["id"] = next_id
-        next_id += 1
+    # Always assign a fresh sequential integer id to guarantee uniqueness
+    raw["businesses"] = [dict(b, id=next_id) if isinstance(b, dict) else b
+                         for next_id, b in enumerate(raw.setdefault("businesses", []), 1)]
 
 # bootstrap: require Qt
 if __name__ == "__main__":
     if PYSIDE_AVAILABLE:  # if PySide6 import succeeded
-        # Only import Yelp/default data if the data file is missing or empty
-        if not os.path.exists(DATA_FILE):
+        # Only import Yelp/default data if there is no saved data (an empty SQLite store is seeded from DATA_FILE)
+        if not os.path.exists(DATA_FILE) and not data_store_exists():
             if os.path.exists(YELP_BUSINESS_FILE):
                 items = import_yelp_academic_businesses(YELP_BUSINESS_FILE, AUTO_IMPORT_CITY, AUTO_IMPORT_LIMIT)
                 if items: